@@ -28,6 +28,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'disease_prediction_app.middleware.metrics_middleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -118,3 +119,114 @@ EMAIL_HOST_PASSWORD = 'your-app-password'
 
 # ML Models path
 ML_MODELS_PATH = BASE_DIR / 'ml_models'
+
+# Positive-class probability above which a prediction is reported as positive
+PREDICTION_THRESHOLDS = {
+    'diabetes': 0.5,
+    'heart_disease': 0.5,
+    'parkinsons': 0.5,
+}
+
+# Joblib model artifacts are memory-mapped with this mode. Copy-on-write ('c')
+# keeps pages shared across workers while still giving libsvm the writable
+# buffers it requires; None loads the arrays into private memory. Mapped
+# files must never be rewritten in place: deploy a new artifact by writing it
+# under a temporary name in the same directory and renaming it over the old one.
+ML_MODELS_MMAP_MODE = 'c'
+
+# Load all prediction models and the chatbot engine when the app starts.
+# /healthz/ready reports 503 until warm-up has finished.
+WARM_UP_ON_STARTUP = os.environ.get('WARM_UP_ON_STARTUP', 'False').lower() in ('1', 'true', 'yes')
+
+# Seconds between checks for changed model artifacts (or manifest.json
+# versions) in ML_MODELS_PATH. Changed models are reloaded in the background
+# and swapped in without restarting workers. When both <model>.joblib and
+# <model>.pkl exist the newer file is served. Set to 0 to disable.
+ML_MODELS_RELOAD_INTERVAL = 30
+
+# Bounded LRU cache of prediction results keyed on disease, model version and
+# the feature vector. TTL is in seconds (None never expires) and MAX_SIZE 0
+# disables the cache. Set BACKEND to a CACHES alias to share hits across workers.
+PREDICTION_CACHE = {
+    'MAX_SIZE': 1024,
+    'TTL': 3600,
+    'BACKEND': None,
+}
+
+# Prefer <model>.linear.npz bundles written by export_linear_models, which
+# score linear models with plain NumPy instead of going through sklearn.
+# A bundle is ignored once the .joblib/.pkl it was exported from changes.
+ML_MODELS_USE_LINEAR_BUNDLES = True
+
+# Merge single-row predictions from concurrent requests into one model call.
+# A batch is scored once it holds MAX_BATCH_SIZE rows or its first row has
+# waited MAX_WAIT_MS milliseconds. A row that is not scored within TIMEOUT_MS
+# is scored directly by the request instead.
+MICRO_BATCHING = {
+    'ENABLED': os.environ.get('MICRO_BATCHING', 'False').lower() in ('1', 'true', 'yes'),
+    'MAX_BATCH_SIZE': 32,
+    'MAX_WAIT_MS': 2,
+    'TIMEOUT_MS': 1000,
+}
+
+# Executor the async views use to run inference off the event loop.
+# KIND is 'thread' or 'process'.
+PREDICTION_EXECUTOR = {
+    'KIND': 'thread',
+    'MAX_WORKERS': 4,
+}
+
+# Route the prediction views and chatbot API to their async versions.
+# Use this when serving through disease_prediction.asgi.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False').lower() in ('1', 'true', 'yes')
+
+# Largest list of records the JSON prediction API scores in one request
+API_MAX_BATCH_SIZE = 1000
+
+# Candidate models scored in the background on live traffic, keyed by
+# disease type, e.g. {'heart_disease': 'heart_disease_model_candidate'}.
+# Results are stored as ShadowPrediction rows next to the live result.
+SHADOW_MODELS = {}
+
+# Shadow jobs beyond this many in flight are dropped instead of queued
+SHADOW_MAX_PENDING = 100
+
+# Directory shared by all worker processes for /metrics aggregation. Each
+# worker writes its metrics there every METRICS_FLUSH_INTERVAL seconds and
+# /metrics reports the sum. Leave unset to report only the serving process.
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = 5
+
+# Fitted chatbot classifier, rebuilt automatically when Training.csv or the
+# training hyperparameters change. Build it ahead of deploy with
+# "python manage.py build_chatbot_model".
+CHATBOT_MODEL_PATH = ML_MODELS_PATH / 'chatbot_model.joblib'
+
+# Bounded LRU cache of chatbot predictions keyed on the set of symptoms and
+# the chatbot model version. Same keys as PREDICTION_CACHE.
+CHATBOT_PREDICTION_CACHE = {
+    'MAX_SIZE': 4096,
+    'TTL': None,
+    'BACKEND': None,
+}
+
+# Training.csv preprocessed into memory-mappable .npy files, rebuilt when the
+# CSV's hash changes.
+CHATBOT_TRAINING_MATRIX_DIR = ML_MODELS_PATH / 'chatbot_training'
+
+# Train the chatbot classifier on the distinct rows of Training.csv, weighted
+# by how often each occurs, instead of on every duplicate row.
+CHATBOT_DEDUPLICATE_TRAINING = True
+
+# Choose chatbot follow-up questions by expected information gain over the
+# training data instead of in column order. Questions stop once the
+# confidence shown for the predicted disease reaches CONFIDENCE (0-1), no
+# question is worth MIN_GAIN bits, or MAX_QUESTIONS have been asked.
+# SMOOTHING is the Laplace prior on symptom frequencies.
+CHATBOT_QUESTION_PLANNER = {
+    'ENABLED': True,
+    'MAX_QUESTIONS': 5,
+    'CONFIDENCE': 0.7,
+    'MIN_GAIN': 0.01,
+    'SMOOTHING': 1.0,
+}
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import UserProfile, Doctor, Prediction, ContactMessage
+from .models import UserProfile, Doctor, Prediction, ShadowPrediction, ContactMessage
 
 
 @admin.register(UserProfile)
@@ -19,12 +19,20 @@ class DoctorAdmin(admin.ModelAdmin):
 
 @admin.register(Prediction)
 class PredictionAdmin(admin.ModelAdmin):
-    list_display = ['user', 'disease_type', 'prediction_result', 'confidence_score', 'created_at']
-    list_filter = ['disease_type', 'created_at', 'prediction_result']
+    list_display = ['user', 'disease_type', 'prediction_result', 'confidence_score', 'model_version', 'created_at']
+    list_filter = ['disease_type', 'created_at', 'prediction_result', 'model_version']
     search_fields = ['user__username', 'disease_type']
     ordering = ['-created_at']
 
 
+@admin.register(ShadowPrediction)
+class ShadowPredictionAdmin(admin.ModelAdmin):
+    list_display = ['disease_type', 'shadow_model_name', 'primary_result', 'shadow_result', 'agrees',
+                    'primary_latency_ms', 'shadow_latency_ms', 'created_at']
+    list_filter = ['disease_type', 'shadow_model_name', 'shadow_model_version', 'agrees', 'created_at']
+    ordering = ['-created_at']
+
+
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'is_read', 'created_at']
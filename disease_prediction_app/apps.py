@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class DiseasePredictionAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'disease_prediction_app'
+
+    def ready(self):
+        # Load models and the chatbot before the first request pays for it
+        if getattr(settings, 'WARM_UP_ON_STARTUP', False):
+            from .warmup import start_warm_up
+            start_warm_up()
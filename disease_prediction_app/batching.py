@@ -0,0 +1,112 @@
+import queue
+import threading
+import time
+from concurrent import futures
+
+import numpy as np
+
+from . import metrics
+
+
+_queue_wait_seconds = metrics.histogram(
+    'micro_batch_queue_wait_seconds', 'Time a row waited in the micro-batch queue before scoring', ('batcher',))
+
+
+class MicroBatcher:
+    """Merges rows submitted by concurrent requests into one vectorized call.
+
+    A background thread takes the first queued row, keeps collecting rows
+    until max_batch_size is reached or max_wait_ms has passed, then scores
+    them together. score_batch receives an (n_rows, n_features) matrix and
+    returns a sequence with one result per row. submit raises TimeoutError
+    if a row is not scored within timeout_ms, so callers can score it
+    themselves instead of hanging.
+    """
+
+    def __init__(self, score_batch, max_batch_size=32, max_wait_ms=2, timeout_ms=1000, name='micro-batcher'):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.timeout = timeout_ms / 1000 if timeout_ms else None
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._rows = 0
+        self._largest_batch = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+
+    def _ensure_started(self):
+        # A batcher copied into a forked process has a thread that no longer runs
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+
+    def submit(self, row):
+        """Queue one feature row and block until its result is ready."""
+        self._ensure_started()
+        future = futures.Future()
+        # Copy, since callers may reuse their feature buffer for the next request
+        self._queue.put((np.array(row, dtype=np.float64).ravel(), future, time.perf_counter()))
+        try:
+            return future.result(timeout=self.timeout)
+        except futures.TimeoutError:
+            raise TimeoutError(f'{self.name} did not score the row within {self.timeout}s') from None
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            waits = [started - queued_at for _, _, queued_at in batch]
+            self._record(len(batch), waits)
+
+            try:
+                results = self.score_batch(np.vstack([row for row, _, _ in batch]))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def _record(self, size, waits):
+        for wait in waits:
+            _queue_wait_seconds.observe(wait, batcher=self.name)
+        with self._stats_lock:
+            self._batches += 1
+            self._rows += size
+            self._largest_batch = max(self._largest_batch, size)
+            self._total_wait += sum(waits)
+            self._max_wait_seen = max(self._max_wait_seen, max(waits))
+
+    def stats(self):
+        """Return batch-size and queue-wait metrics."""
+        with self._stats_lock:
+            return {
+                'batches': self._batches,
+                'rows': self._rows,
+                'mean_batch_size': round(self._rows / self._batches, 2) if self._batches else 0.0,
+                'max_batch_size': self._largest_batch,
+                'mean_queue_wait_ms': round(self._total_wait / self._rows * 1000, 3) if self._rows else 0.0,
+                'max_queue_wait_ms': round(self._max_wait_seen * 1000, 3),
+                'queued': self._queue.qsize(),
+            }
@@ -0,0 +1,101 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded in-process LRU cache with optional TTL and a shared second tier.
+
+    Lookups check the local cache first and then, when a Django cache alias
+    is configured, the shared backend so hits carry across workers.
+    """
+
+    def __init__(self, max_size=1024, ttl=None, backend=None, key_prefix=''):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = caches[backend] if backend else None
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared_key(self, key):
+        return self.key_prefix + hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default when absent or expired."""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                value, expires_at = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+        if self.backend is not None:
+            value = self.backend.get(self._shared_key(key), _MISSING)
+            if value is not _MISSING:
+                self._store(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def _store(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def set(self, key, value):
+        """Store a value locally and in the shared backend if one is configured."""
+        if self.max_size <= 0:
+            return
+        self._store(key, value)
+        if self.backend is not None:
+            self.backend.set(self._shared_key(key), value, timeout=self.ttl)
+
+    def clear(self):
+        """Empty the local cache and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.shared_hits = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared_hits': self.shared_hits,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def build_cache(config, key_prefix):
+    """Create an LRUCache from a settings dict with MAX_SIZE, TTL and BACKEND keys."""
+    return LRUCache(
+        max_size=config.get('MAX_SIZE', 1024),
+        ttl=config.get('TTL'),
+        backend=config.get('BACKEND'),
+        key_prefix=key_prefix,
+    )
@@ -1,27 +1,279 @@
-import re
+import hashlib
+import json
 import random
 import pandas as pd
 import numpy as np
 import csv
 import os
+import threading
+import joblib
+import sklearn
 from django.conf import settings
 from sklearn import preprocessing
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
-from difflib import get_close_matches
 import warnings
+from . import metrics
+from .cache_utils import build_cache
+from .symptom_matcher import SymptomMatcher
+from .forest_scorer import ForestScorer, export_forest
+from .question_planner import QuestionPlanner
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+_stage_seconds = metrics.histogram(
+    'chatbot_stage_seconds', 'Time spent in each chatbot processing stage', ('stage',))
+_predictions_total = metrics.counter(
+    'chatbot_predictions_total', 'Chatbot disease predictions, by whether the result came from the cache',
+    ('source',))
+
+# Hyperparameters of the symptom classifier. Part of the artifact key, so
+# changing them retrains the model on the next start.
+TRAINING_PARAMS = {
+    'test_size': 0.33,
+    'random_state': 42,
+    'n_estimators': 300,
+}
+
+# Bump when the contents of the saved artifact change
+ARTIFACT_FORMAT = 3
+
+
+def read_training_data(training_path):
+    """Read Training.csv with duplicate symptom columns removed."""
+    training = pd.read_csv(training_path)
+
+    # Clean duplicate column names
+    training.columns = training.columns.str.replace(r"\.\d+$", "", regex=True)
+    return training.loc[:, ~training.columns.duplicated()]
+
+
+def file_hash(path):
+    """Hex sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TrainingMatrix:
+    """Training.csv as a uint8 symptom matrix, disease label codes and vocabularies.
+
+    Label codes index the sorted disease names, matching LabelEncoder.
+    """
+
+    def __init__(self, symptoms, labels, columns, diseases, source_hash):
+        self.symptoms = symptoms
+        self.labels = labels
+        self.columns = list(columns)
+        self.diseases = [str(disease) for disease in diseases]
+        self.source_hash = source_hash
+
+    @classmethod
+    def from_csv(cls, training_path):
+        training = read_training_data(training_path)
+        diseases, labels = np.unique(training['prognosis'].to_numpy(dtype=str), return_inverse=True)
+        return cls(
+            np.ascontiguousarray(training.iloc[:, :-1].to_numpy(), dtype=np.uint8),
+            labels.astype(np.int32),
+            training.columns[:-1],
+            diseases,
+            file_hash(training_path),
+        )
+
+    def save(self, directory):
+        """Write the matrix as .npy files that can be memory-mapped, metadata last."""
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            # Readers never pair new arrays with old metadata
+            os.remove(meta_path)
+        for name in ('symptoms', 'labels'):
+            temp_path = os.path.join(directory, f'{name}.{os.getpid()}.tmp.npy')
+            np.save(temp_path, getattr(self, name))
+            os.replace(temp_path, os.path.join(directory, f'{name}.npy'))
+
+        temp_path = f'{meta_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'columns': self.columns, 'diseases': self.diseases, 'source_hash': self.source_hash}, file)
+        os.replace(temp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory, source_hash):
+        """Return the saved matrix if it was built from source_hash, otherwise None."""
+        try:
+            with open(os.path.join(directory, 'meta.json')) as file:
+                meta = json.load(file)
+            if meta['source_hash'] != source_hash:
+                return None
+            return cls(
+                np.load(os.path.join(directory, 'symptoms.npy'), mmap_mode='r'),
+                np.load(os.path.join(directory, 'labels.npy'), mmap_mode='r'),
+                meta['columns'],
+                meta['diseases'],
+                source_hash,
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def get_training_matrix_dir():
+    return str(getattr(settings, 'CHATBOT_TRAINING_MATRIX_DIR',
+                       os.path.join(settings.ML_MODELS_PATH, 'chatbot_training')))
+
+
+def load_training_matrix(training_path, force=False):
+    """Load the preprocessed training matrix, rebuilding it when Training.csv changed."""
+    directory = get_training_matrix_dir()
+    source_hash = file_hash(training_path)
+    matrix = None if force else TrainingMatrix.load(directory, source_hash)
+    if matrix is not None:
+        return matrix
+
+    matrix = TrainingMatrix.from_csv(training_path)
+    try:
+        matrix.save(directory)
+    except OSError as e:
+        print(f"Error saving training matrix {directory}: {e}")
+    return matrix
+
+
+def deduplicate_training():
+    return getattr(settings, 'CHATBOT_DEDUPLICATE_TRAINING', True)
+
+
+def training_key(matrix):
+    """Hash of the training data, hyperparameters and sklearn version."""
+    digest = hashlib.sha256(matrix.source_hash.encode())
+    params = dict(TRAINING_PARAMS, format=ARTIFACT_FORMAT, deduplicate=deduplicate_training())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    # Pickled estimators are only safe to load with the version that wrote them
+    digest.update(sklearn.__version__.encode())
+    return digest.hexdigest()
+
+
+def split_training(matrix):
+    """Train/test split of the training matrix, as (x_train, x_test, y_train, y_test)."""
+    return train_test_split(
+        matrix.symptoms, np.asarray(matrix.labels),
+        test_size=TRAINING_PARAMS['test_size'], random_state=TRAINING_PARAMS['random_state']
+    )
+
+
+def fit_forest(x, y, deduplicate=True):
+    """Fit the symptom classifier, optionally on unique rows weighted by their counts."""
+    model = RandomForestClassifier(
+        n_estimators=TRAINING_PARAMS['n_estimators'], random_state=TRAINING_PARAMS['random_state']
+    )
+    if not deduplicate:
+        return model.fit(x, y)
+
+    # Training.csv repeats a few hundred patterns thousands of times
+    rows, counts = np.unique(np.column_stack([x, y]), axis=0, return_counts=True)
+    model.set_params(n_jobs=-1)
+    model.fit(rows[:, :-1], rows[:, -1], sample_weight=counts)
+    # Predictions on single rows are slower with a thread pool
+    return model.set_params(n_jobs=None)
+
+
+def train_model(matrix):
+    """Fit the symptom classifier and return it with its label encoder and symptom index."""
+    # Label Encoding
+    le = preprocessing.LabelEncoder()
+    le.fit(np.array(matrix.diseases, dtype=object))
+
+    # Split before deduplicating, so held-out rows never leak into training
+    x_train, x_test, y_train, y_test = split_training(matrix)
+    model = fit_forest(x_train, y_train, deduplicate=deduplicate_training())
+
+    # Only the flattened arrays are kept: they memory-map and are shared
+    # across workers, while an unpickled sklearn forest is private to each
+    return {
+        'forest': export_forest(model),
+        'label_encoder': le,
+        'symptoms_dict': {symptom: idx for idx, symptom in enumerate(matrix.columns)},
+    }
+
+
+def build_disease_index(matrix):
+    """Bitmask of each disease's symptoms, from its first row in the training data."""
+    _, first_rows = np.unique(matrix.labels, return_index=True)
+    weights = 1 << np.arange(len(matrix.columns), dtype=object)
+    return {
+        matrix.diseases[matrix.labels[row]]: int((matrix.symptoms[row] == 1).astype(object) @ weights)
+        for row in first_rows
+    }
+
+
+def get_chatbot_cache():
+    """Create the chatbot prediction cache from CHATBOT_PREDICTION_CACHE, or None if disabled."""
+    config = getattr(settings, 'CHATBOT_PREDICTION_CACHE', {})
+    if config.get('MAX_SIZE', 1024) <= 0:
+        return None
+    return build_cache(config, key_prefix='chatbot:')
+
+
+def get_planner_config():
+    return getattr(settings, 'CHATBOT_QUESTION_PLANNER', {})
+
+
+def get_chatbot_model_path():
+    return str(getattr(settings, 'CHATBOT_MODEL_PATH',
+                       os.path.join(settings.ML_MODELS_PATH, 'chatbot_model.joblib')))
+
+
+def save_artifact(artifact, path):
+    """Write a trained artifact atomically, so other workers never read half a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    joblib.dump(artifact, temp_path, compress=0)
+    os.replace(temp_path, path)
+
+
+def load_artifact(path, key):
+    """Return the artifact stored at path if it was built for key, otherwise None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        # Memory-mapped, so workers share the forest arrays instead of copying them
+        artifact = joblib.load(path, mmap_mode=getattr(settings, 'ML_MODELS_MMAP_MODE', 'c'))
+    except Exception as e:
+        print(f"Error loading chatbot model {path}: {e}")
+        return None
+    return artifact if artifact.get('key') == key else None
+
+
+def load_or_train(matrix, force=False):
+    """Load the cached chatbot model, training and saving it when stale or missing."""
+    path = get_chatbot_model_path()
+    key = training_key(matrix)
+    artifact = None if force else load_artifact(path, key)
+    if artifact is not None:
+        return artifact
+
+    artifact = dict(train_model(matrix), key=key)
+    try:
+        save_artifact(artifact, path)
+    except OSError as e:
+        print(f"Error saving chatbot model {path}: {e}")
+    return artifact
+
+
 class HealthChatbot:
     def __init__(self):
-        self.model = None
+        self.forest = None
+        self.model_version = ''
+        self.prediction_cache = get_chatbot_cache()
         self.le = None
         self.symptoms_dict = {}
         self.severity_dictionary = {}
         self.description_list = {}
         self.precaution_dictionary = {}
         self.cols = None
-        self.training = None
+        self.symptom_names = ()
+        self.symptom_matcher = None
+        self.disease_symptoms = {}
+        self.question_planner = None
         self.quotes = [
             "⚡ Health is wealth, take care of yourself.",
             "⚡ A healthy outside starts from the inside.",
@@ -50,32 +302,26 @@ class HealthChatbot:
     def initialize_model(self):
         """Initialize the ML model and load data"""
         try:
-            # Load training data
+            # Load training data, preprocessed once per change of Training.csv
             training_path = os.path.join(settings.BASE_DIR, 'chatbot', 'Data', 'Training.csv')
-            self.training = pd.read_csv(training_path)
-            
-            # Clean duplicate column names
-            self.training.columns = self.training.columns.str.replace(r"\.\d+$", "", regex=True)
-            self.training = self.training.loc[:, ~self.training.columns.duplicated()]
-            
-            # Features and labels
-            self.cols = self.training.columns[:-1]
-            x = self.training[self.cols]
-            y = self.training['prognosis']
-            
-            # Label Encoding
-            self.le = preprocessing.LabelEncoder()
-            y = self.le.fit_transform(y)
-            
-            # Train-test split
-            x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.33, random_state=42)
-            
-            # Model
-            self.model = RandomForestClassifier(n_estimators=300, random_state=42)
-            self.model.fit(x_train, y_train)
-            
-            # Create symptoms dictionary
-            self.symptoms_dict = {symptom: idx for idx, symptom in enumerate(self.cols)}
+            matrix = load_training_matrix(training_path)
+
+            # Features
+            self.cols = pd.Index(matrix.columns)
+            self.symptom_names = tuple(matrix.columns)
+            self.symptom_matcher = SymptomMatcher(self.cols, self.symptom_synonyms)
+            self.disease_symptoms = build_disease_index(matrix)
+            self.question_planner = QuestionPlanner(
+                matrix.symptoms, matrix.labels, len(matrix.diseases),
+                smoothing=get_planner_config().get('SMOOTHING', 1.0),
+            )
+
+            # Reuse the fitted model when the training data has not changed
+            artifact = load_or_train(matrix)
+            self.forest = ForestScorer(artifact['forest'])
+            self.model_version = artifact['key'][:12]
+            self.le = artifact['label_encoder']
+            self.symptoms_dict = artifact['symptoms_dict']
             
             # Load additional data
             self.load_severity_dict()
@@ -84,7 +330,7 @@ class HealthChatbot:
             
         except Exception as e:
             print(f"Error initializing model: {e}")
-            self.model = None
+            self.forest = None
 
     def load_severity_dict(self):
         """Load symptom severity data"""
@@ -119,46 +365,43 @@ class HealthChatbot:
         except Exception as e:
             print(f"Error loading precaution dictionary: {e}")
 
+    @_stage_seconds.timed(stage='extract_symptoms')
     def extract_symptoms(self, user_input):
         """Extract symptoms from user input"""
-        extracted = []
         text = user_input.lower().replace("-", " ")
+        return list(self.symptom_matcher.extract(text))
 
-        # 1. Synonym replacement
-        for phrase, mapped in self.symptom_synonyms.items():
-            if phrase in text:
-                extracted.append(mapped)
-
-        # 2. Exact match
-        for symptom in self.cols:
-            if symptom.replace("_", " ") in text:
-                extracted.append(symptom)
-
-        # 3. Fuzzy match (typo handling)
-        words = re.findall(r"\w+", text)
-        for word in words:
-            close = get_close_matches(word, [s.replace("_", " ") for s in self.cols], n=1, cutoff=0.8)
-            if close:
-                for sym in self.cols:
-                    if sym.replace("_", " ") == close[0]:
-                        extracted.append(sym)
-
-        return list(set(extracted))
-
+    @_stage_seconds.timed(stage='predict_disease')
     def predict_disease(self, symptoms_list):
         """Predict disease based on symptoms"""
-        if not self.model:
+        if self.forest is None:
             return None, 0, None
+
+        # The same symptom set scored by the same model gives the same result
+        cache = self.prediction_cache
+        if cache is not None:
+            cache_key = (self.model_version, self.symptom_mask(symptoms_list))
+            result = cache.get(cache_key)
+            if result is not None:
+                _predictions_total.inc(source='cache')
+                return result
             
         input_vector = np.zeros(len(self.symptoms_dict))
         for symptom in symptoms_list:
             if symptom in self.symptoms_dict:
                 input_vector[self.symptoms_dict[symptom]] = 1
 
-        pred_proba = self.model.predict_proba([input_vector])[0]
+        # Same probabilities as the sklearn forest's predict_proba, without its per-call overhead
+        pred_proba = self.forest.predict_proba(input_vector[None, :])[0]
         pred_class = np.argmax(pred_proba)
         disease = self.le.inverse_transform([pred_class])[0]
         confidence = round(pred_proba[pred_class] * 100, 2)
+        _predictions_total.inc(source='model')
+
+        if cache is not None:
+            # Cached results are shared between callers
+            pred_proba.flags.writeable = False
+            cache.set(cache_key, (disease, confidence, pred_proba))
         return disease, confidence, pred_proba
 
     def get_disease_description(self, disease):
@@ -173,26 +416,76 @@ class HealthChatbot:
         """Get a random empathy quote"""
         return random.choice(self.quotes)
 
+    def symptom_mask(self, symptoms):
+        """Bitmask with the bit of every known symptom in symptoms set."""
+        mask = 0
+        for symptom in symptoms:
+            index = self.symptoms_dict.get(symptom)
+            if index is not None:
+                mask |= 1 << index
+        return mask
+
+    def symptoms_from_mask(self, mask):
+        """Symptoms whose bits are set in mask, in column order."""
+        symptoms = []
+        while mask:
+            lowest = mask & -mask
+            symptoms.append(self.symptom_names[lowest.bit_length() - 1])
+            mask ^= lowest
+        return symptoms
+
+    @_stage_seconds.timed(stage='get_related_symptoms')
     def get_related_symptoms(self, disease, current_symptoms):
         """Get related symptoms for a disease"""
-        if self.training is None:
+        disease_mask = self.disease_symptoms.get(disease)
+        if disease_mask is None:
             return []
-            
-        disease_symptoms = list(self.training[self.training['prognosis'] == disease].iloc[0][:-1].index[
-            self.training[self.training['prognosis'] == disease].iloc[0][:-1] == 1
-        ])
-        
+
         # Return symptoms not already mentioned
-        return [symptom for symptom in disease_symptoms if symptom not in current_symptoms]
+        return self.symptoms_from_mask(disease_mask & ~self.symptom_mask(current_symptoms))
+
+    @_stage_seconds.timed(stage='next_question')
+    def next_question(self, symptoms, denied_symptoms):
+        """Symptom the question planner would ask about next, or None once confident enough"""
+        if self.question_planner is None:
+            return None
+
+        # Stop on the confidence the user is shown, which comes from the forest
+        config = get_planner_config()
+        _, confidence, _ = self.predict_disease(symptoms)
+        if confidence >= config.get('CONFIDENCE', 0.7) * 100:
+            return None
+
+        present = [self.symptoms_dict[symptom] for symptom in symptoms if symptom in self.symptoms_dict]
+        absent = [self.symptoms_dict[symptom] for symptom in denied_symptoms if symptom in self.symptoms_dict]
+        index = self.question_planner.next_question(
+            present, absent,
+            min_gain=config.get('MIN_GAIN', 0.01),
+        )
+        return None if index is None else self.symptom_names[index]
 
 # Global chatbot instance
 chatbot_instance = None
+_chatbot_lock = threading.Lock()
+
+
+def _reset_lock_after_fork():
+    global _chatbot_lock
+    # A parent thread may have been building the chatbot when the worker forked
+    _chatbot_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_lock_after_fork)
+
 
 def get_chatbot():
     """Get or create chatbot instance"""
     global chatbot_instance
     if chatbot_instance is None:
-        chatbot_instance = HealthChatbot()
+        # Warm-up and the first request may race to build the instance
+        with _chatbot_lock:
+            if chatbot_instance is None:
+                chatbot_instance = HealthChatbot()
     return chatbot_instance
 
 
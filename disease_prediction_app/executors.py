@@ -0,0 +1,31 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.conf import settings
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def init_worker():
+    """Make sure Django is configured in pool processes started with spawn."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'disease_prediction.settings')
+    django.setup()
+
+
+def get_prediction_executor():
+    """Return the bounded executor that runs CPU-bound inference off the event loop."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                config = getattr(settings, 'PREDICTION_EXECUTOR', {})
+                max_workers = config.get('MAX_WORKERS', 4)
+                if config.get('KIND', 'thread') == 'process':
+                    _executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker)
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prediction')
+    return _executor
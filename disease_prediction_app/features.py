@@ -0,0 +1,114 @@
+import operator
+import threading
+
+import numpy as np
+import pandas as pd
+from django import forms
+
+from .forms import DiabetesPredictionForm, HeartDiseasePredictionForm, ParkinsonsPredictionForm
+
+
+class FeatureSchema:
+    """Ordered model inputs for one disease with their dtypes and valid ranges.
+
+    Schemas are built from the prediction forms, so the column order the
+    models receive can never drift from the fields the forms collect.
+    """
+
+    def __init__(self, fields):
+        # fields is a list of (name, dtype, min_value, max_value)
+        self.fields = list(fields)
+        self.names = [name for name, _, _, _ in self.fields]
+        self.n_features = len(self.fields)
+
+        self._int_columns = np.array([dtype is int for _, dtype, _, _ in self.fields])
+        self._has_int_columns = bool(self._int_columns.any())
+        self._min = np.array([-np.inf if low is None else low for _, _, low, _ in self.fields], dtype=np.float64)
+        self._max = np.array([np.inf if high is None else high for _, _, _, high in self.fields], dtype=np.float64)
+
+        # itemgetter pulls every field out of a record in a single C call
+        getter = operator.itemgetter(*self.names)
+        self._getter = getter if self.n_features > 1 else (lambda data: (getter(data),))
+        self._local = threading.local()
+
+    @classmethod
+    def from_form(cls, form_class):
+        """Build a schema from the fields of a prediction form, in declaration order."""
+        fields = []
+        for name, field in form_class.base_fields.items():
+            if isinstance(field, forms.FloatField):
+                fields.append((name, float, field.min_value, field.max_value))
+            elif isinstance(field, forms.IntegerField):
+                fields.append((name, int, field.min_value, field.max_value))
+            elif isinstance(field, forms.ChoiceField):
+                values = [int(value) for value, _ in field.choices]
+                fields.append((name, int, min(values), max(values)))
+            else:
+                raise TypeError(f"Unsupported form field for {name}: {type(field).__name__}")
+        return cls(fields)
+
+    def _row_buffer(self):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = np.empty((1, self.n_features), dtype=np.float64)
+        return buffer
+
+    def extract(self, data, out=None):
+        """Fill a (1, n_features) float buffer from one record.
+
+        Without out, a per-thread buffer is reused, so the returned array is
+        only valid until the next extract() call on the same thread.
+        """
+        if out is None:
+            out = self._row_buffer()
+        out[0] = self._getter(data)
+        if self._has_int_columns:
+            np.trunc(out, out=out, where=self._int_columns)
+        return out
+
+    def extract_batch(self, records, out=None):
+        """Build an (n_rows, n_features) float matrix from records or a DataFrame."""
+        if isinstance(records, pd.DataFrame):
+            # Unparseable cells become NaN, so they are flagged like missing values
+            matrix = records[self.names].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+            if out is not None:
+                out[:] = matrix
+                matrix = out
+        else:
+            matrix = out if out is not None else np.empty((len(records), self.n_features), dtype=np.float64)
+            getter = self._getter
+            for i, data in enumerate(records):
+                matrix[i] = getter(data)
+
+        if self._has_int_columns:
+            np.trunc(matrix, out=matrix, where=self._int_columns)
+        return matrix
+
+    def invalid_rows(self, matrix):
+        """Return the indices of rows with a missing or out-of-range value."""
+        bad = np.isnan(matrix) | (matrix < self._min) | (matrix > self._max)
+        return np.flatnonzero(bad.any(axis=1))
+
+    def validate(self, matrix):
+        """Raise ValueError naming the first value outside the ranges the form enforces."""
+        rows = self.invalid_rows(matrix)
+        if len(rows) == 0:
+            return
+
+        row = rows[0]
+        for column, (name, _, low, high) in enumerate(self.fields):
+            value = matrix[row, column]
+            if np.isnan(value):
+                raise ValueError(f"Row {row}: {name} is missing")
+            if low is not None and value < low:
+                raise ValueError(f"Row {row}: {name} must be at least {low}")
+            if high is not None and value > high:
+                raise ValueError(f"Row {row}: {name} must be at most {high}")
+
+
+# One schema per Prediction.disease_type
+SCHEMAS = {
+    'diabetes': FeatureSchema.from_form(DiabetesPredictionForm),
+    'heart_disease': FeatureSchema.from_form(HeartDiseasePredictionForm),
+    'parkinsons': FeatureSchema.from_form(ParkinsonsPredictionForm),
+}
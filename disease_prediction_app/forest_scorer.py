@@ -0,0 +1,96 @@
+import joblib
+import numpy as np
+
+
+def export_forest(forest):
+    """Flatten a fitted single-output forest classifier into contiguous node arrays.
+
+    All trees share one set of arrays; roots holds each tree's first node.
+    Leaves point to themselves, so every row can take the same number of
+    steps regardless of the depth at which it reaches its leaf.
+    """
+    if getattr(forest, 'n_outputs_', 1) != 1:
+        raise ValueError("Only single-output forests can be exported")
+
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        nodes = np.arange(n_nodes)
+        is_leaf = tree.children_left == -1
+
+        value = tree.value[:, 0, :].astype(np.float64)
+        # Older sklearn versions store class counts rather than fractions
+        totals = value.sum(axis=1, keepdims=True)
+        if not np.allclose(totals[is_leaf], 1.0):
+            value = value / np.where(totals == 0.0, 1.0, totals)
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+        values.append(value)
+        roots.append(offset)
+        offset += n_nodes
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        'feature': np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+        'threshold': np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+        'left': np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+        'right': np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+        'value': np.ascontiguousarray(np.concatenate(values)),
+        'roots': np.asarray(roots, dtype=np.intp),
+        'max_depth': max_depth,
+        'classes': np.asarray(forest.classes_),
+        'n_features': int(forest.n_features_in_),
+    }
+
+
+def save_forest(bundle, path):
+    """Write an exported forest uncompressed, so it can be memory-mapped on load."""
+    joblib.dump(bundle, path, compress=0)
+
+
+class ForestScorer:
+    """Scores an exported forest by walking all trees at once with NumPy.
+
+    predict_proba matches RandomForestClassifier.predict_proba: rows are
+    cast to float32 like sklearn does before comparing against thresholds,
+    and leaf distributions are summed in tree order before averaging.
+    """
+
+    def __init__(self, bundle):
+        self.feature = bundle['feature']
+        self.threshold = bundle['threshold']
+        self.left = bundle['left']
+        self.right = bundle['right']
+        self.value = bundle['value']
+        self.roots = bundle['roots']
+        self.max_depth = int(bundle['max_depth'])
+        self.classes_ = bundle['classes']
+        self.n_features_in_ = int(bundle['n_features'])
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Load a saved forest; with mmap_mode, workers share its pages read-only."""
+        return cls(joblib.load(path, mmap_mode=mmap_mode))
+
+    def apply(self, features):
+        """Return the global leaf index reached in every tree, shaped (n_trees, n_rows)."""
+        features = np.asarray(features, dtype=np.float32)
+        rows = np.arange(len(features))
+        nodes = np.repeat(self.roots[:, None], len(features), axis=1)
+        for _ in range(self.max_depth):
+            goes_left = features[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(goes_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, features):
+        leaves = self.apply(features)
+        return self.value[leaves].sum(axis=0) / len(self.roots)
+
+    def predict(self, features):
+        return self.classes_[np.argmax(self.predict_proba(features), axis=1)]
@@ -0,0 +1,195 @@
+import os
+
+import numpy as np
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.svm import SVC
+
+
+# libsvm clamps pairwise probabilities to this range before coupling them
+_LIBSVM_MIN_PROB = 1e-7
+
+
+def _fold_scaler(scaler, coef, intercept):
+    """Fold a fitted scaler into the linear weights that follow it."""
+    if isinstance(scaler, StandardScaler):
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones_like(coef)
+        mean = scaler.mean_ if scaler.with_mean and scaler.mean_ is not None else np.zeros_like(coef)
+        coef = coef / scale
+        return coef, intercept - np.dot(coef, mean)
+    if isinstance(scaler, MinMaxScaler):
+        return coef * scaler.scale_, intercept + np.dot(coef, scaler.min_)
+    raise ValueError(f"Unsupported preprocessing step: {type(scaler).__name__}")
+
+
+def export_linear_bundle(estimator):
+    """Turn a fitted binary linear estimator into a dict of NumPy arrays.
+
+    Supports LogisticRegression, linear-kernel SVC (with or without Platt
+    calibration) and any other binary estimator exposing coef_/intercept_,
+    optionally behind StandardScaler or MinMaxScaler steps in a Pipeline.
+    Raises ValueError for anything that cannot be scored as a dot product.
+    """
+    steps = []
+    if isinstance(estimator, Pipeline):
+        steps = [step for _, step in estimator.steps[:-1] if step is not None and step != 'passthrough']
+        estimator = estimator.steps[-1][1]
+
+    if isinstance(estimator, SVC) and estimator.kernel != 'linear':
+        raise ValueError(f"SVC with kernel '{estimator.kernel}' is not linear")
+    if not hasattr(estimator, 'coef_') or not hasattr(estimator, 'intercept_'):
+        raise ValueError(f"{type(estimator).__name__} has no linear coefficients")
+
+    coef = np.asarray(estimator.coef_, dtype=np.float64)
+    intercept = np.asarray(estimator.intercept_, dtype=np.float64).ravel()
+    if coef.shape[0] != 1 or len(estimator.classes_) != 2:
+        raise ValueError("Only binary classifiers can be exported")
+    coef, intercept = coef[0], float(intercept[0])
+
+    for scaler in reversed(steps):
+        coef, intercept = _fold_scaler(scaler, coef, intercept)
+
+    if isinstance(estimator, LogisticRegression):
+        kind, prob_a, prob_b = 'logistic', 0.0, 0.0
+    elif isinstance(estimator, SVC) and getattr(estimator, 'probability', False):
+        kind, prob_a, prob_b = 'platt', float(estimator.probA_[0]), float(estimator.probB_[0])
+    else:
+        kind, prob_a, prob_b = 'linear', 0.0, 0.0
+
+    return {
+        'kind': np.array(kind),
+        'coef': np.ascontiguousarray(coef),
+        'intercept': np.array(intercept),
+        'classes': np.asarray(estimator.classes_),
+        'prob_a': np.array(prob_a),
+        'prob_b': np.array(prob_b),
+    }
+
+
+def save_bundle(bundle, path):
+    """Write an exported bundle as an uncompressed .npz file, replacing any old one atomically."""
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        np.savez(file, **bundle)
+    os.replace(temp_path, path)
+
+
+def _couple_row(r01):
+    """Scalar version of _couple_binary_probabilities for a single row."""
+    r10 = 1.0 - r01
+    q00, q11, q01 = r10 * r10, r01 * r01, -r10 * r01
+    p0 = p1 = 0.5
+    for _ in range(100):
+        qp0 = q00 * p0 + q01 * p1
+        qp1 = q01 * p0 + q11 * p1
+        pqp = p0 * qp0 + p1 * qp1
+        if max(abs(qp0 - pqp), abs(qp1 - pqp)) < 0.005 / 2:
+            break
+
+        diff = (-qp0 + pqp) / q00
+        p0 += diff
+        pqp = (pqp + diff * (diff * q00 + 2 * qp0)) / (1 + diff) / (1 + diff)
+        qp0, qp1 = (qp0 + diff * q00) / (1 + diff), (qp1 + diff * q01) / (1 + diff)
+        p0, p1 = p0 / (1 + diff), p1 / (1 + diff)
+
+        diff = (-qp1 + pqp) / q11
+        p1 += diff
+        p0, p1 = p0 / (1 + diff), p1 / (1 + diff)
+    return p0, p1
+
+
+def _couple_binary_probabilities(r01):
+    """Port of libsvm's multiclass_probability for two classes, vectorized over rows.
+
+    libsvm refines the Platt estimate iteratively and stops at a tolerance,
+    so reproducing sklearn's SVC.predict_proba needs the same iterations.
+    """
+    r10 = 1.0 - r01
+    n_rows = len(r01)
+    q = np.empty((n_rows, 2, 2))
+    q[:, 0, 0] = r10 * r10
+    q[:, 1, 1] = r01 * r01
+    q[:, 0, 1] = q[:, 1, 0] = -r10 * r01
+
+    p = np.full((n_rows, 2), 0.5)
+    eps = 0.005 / 2
+    active = np.ones(n_rows, dtype=bool)
+    for _ in range(100):
+        qp = np.einsum('nij,nj->ni', q, p)
+        pqp = np.einsum('ni,ni->n', p, qp)
+        max_error = np.abs(qp - pqp[:, None]).max(axis=1)
+        active &= max_error >= eps
+        if not active.any():
+            break
+
+        for t in range(2):
+            diff = np.where(active, (-qp[:, t] + pqp) / q[:, t, t], 0.0)
+            p[:, t] += diff
+            pqp = (pqp + diff * (diff * q[:, t, t] + 2 * qp[:, t])) / (1 + diff) / (1 + diff)
+            qp = (qp + diff[:, None] * q[:, t, :]) / (1 + diff)[:, None]
+            p /= (1 + diff)[:, None]
+    return p
+
+
+class LinearScorer:
+    """Scores an exported linear bundle with one dot product per call.
+
+    Exposes the subset of the sklearn classifier API that ml_utils uses, so
+    it can stand in for the estimator it was exported from.
+    """
+
+    def __init__(self, bundle):
+        self.kind = str(bundle['kind'])
+        self.coef = np.asarray(bundle['coef'], dtype=np.float64)
+        self.intercept = float(bundle['intercept'])
+        self.classes_ = np.asarray(bundle['classes'])
+        self.prob_a = float(bundle['prob_a'])
+        self.prob_b = float(bundle['prob_b'])
+        self.n_features_in_ = len(self.coef)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as bundle:
+            return cls(bundle)
+
+    @staticmethod
+    def read_source(path):
+        """Return the digest of the artifact a bundle was exported from, or '' if unknown."""
+        with np.load(path, allow_pickle=False) as bundle:
+            return str(bundle['source']) if 'source' in bundle.files else ''
+
+    def decision_function(self, features):
+        return np.asarray(features, dtype=np.float64) @ self.coef + self.intercept
+
+    def _predict_proba(self, features):
+        scores = self.decision_function(features)
+        if self.kind == 'logistic':
+            positive = expit(scores)
+            return np.column_stack([1.0 - positive, positive])
+
+        # libsvm's sign convention is the reverse of decision_function's
+        r01 = 1.0 / (1.0 + np.exp(-scores * self.prob_a + self.prob_b))
+        r01 = np.clip(r01, _LIBSVM_MIN_PROB, 1 - _LIBSVM_MIN_PROB)
+        if len(r01) == 1:
+            return np.array([_couple_row(float(r01[0]))])
+        return _couple_binary_probabilities(r01)
+
+    @property
+    def predict_proba(self):
+        # Like sklearn, only calibrated models offer probabilities
+        if self.kind == 'linear':
+            raise AttributeError("predict_proba is not available for uncalibrated linear models")
+        return self._predict_proba
+
+    def predict(self, features):
+        # sklearn predicts from the decision sign, even for calibrated SVMs
+        return self.classes_[(self.decision_function(features) > 0).astype(int)]
+
+
+def max_difference(estimator, scorer, features):
+    """Return the largest gap between sklearn and the bundle on the given rows."""
+    if hasattr(scorer, 'predict_proba'):
+        return float(np.abs(estimator.predict_proba(features) - scorer.predict_proba(features)).max())
+    return float(np.abs(estimator.decision_function(features) - scorer.decision_function(features)).max())
@@ -0,0 +1,226 @@
+import json
+import os
+import pickle
+import platform
+import subprocess
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import sklearn
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+
+from disease_prediction_app import ml_utils
+
+
+# Stand-in estimators, matching the algorithms the README lists per model
+ESTIMATORS = {
+    'diabetes': lambda: SVC(kernel='linear', probability=True, random_state=42),
+    'heart_disease': lambda: LogisticRegression(max_iter=1000),
+    'parkinsons': lambda: SVC(kernel='rbf', probability=True, random_state=42),
+}
+
+
+def _summarize(samples, rows_per_call=1):
+    """Return latency percentiles in milliseconds and throughput in rows per second."""
+    samples = np.asarray(samples)
+    return {
+        'calls': len(samples),
+        'mean_ms': round(samples.mean() * 1000, 4),
+        'p50_ms': round(np.percentile(samples, 50) * 1000, 4),
+        'p95_ms': round(np.percentile(samples, 95) * 1000, 4),
+        'p99_ms': round(np.percentile(samples, 99) * 1000, 4),
+        'rows_per_second': round(rows_per_call * len(samples) / samples.sum(), 1),
+    }
+
+
+def _time_calls(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the ml_utils prediction path with generated stand-in models'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=1000,
+            help='Timed calls per single-row measurement (default: 1000)',
+        )
+        parser.add_argument(
+            '--batch-sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000],
+            help='Batch sizes to measure (default: 10 100 1000)',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['pkl', 'joblib'],
+            default='joblib',
+            help='Artifact format for the stand-in models (default: joblib)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON results of an earlier run to compare p50 latencies against',
+        )
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(42)
+        iterations = options['iterations']
+        results = {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'artifact_format': options['format'],
+            'iterations': iterations,
+            'diseases': {},
+        }
+
+        with tempfile.TemporaryDirectory() as models_dir:
+            for disease in ml_utils.DISEASES:
+                self._write_model(disease, models_dir, options['format'], rng)
+
+            # Measure the model path itself, not the result cache or reload checks
+            with override_settings(
+                ML_MODELS_PATH=models_dir,
+                ML_MODELS_RELOAD_INTERVAL=0,
+                PREDICTION_CACHE={'MAX_SIZE': 0},
+            ):
+                ml_utils.clear_model_registry()
+                try:
+                    for disease in ml_utils.DISEASES:
+                        self.stdout.write(f'Benchmarking {disease}...')
+                        results['diseases'][disease] = self._benchmark(
+                            disease, rng, iterations, options['batch_sizes']
+                        )
+                finally:
+                    ml_utils.clear_model_registry()
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                baseline = json.load(file)
+
+        self._report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def _random_records(self, disease, rng, count):
+        """Generate input records inside the ranges the feature schema allows."""
+        schema = ml_utils.DISEASES[disease]['schema']
+        records = []
+        for _ in range(count):
+            record = {}
+            for name, dtype, low, high in schema.fields:
+                low = 0 if low is None else low
+                high = low + 100 if high is None else high
+                value = rng.uniform(low, high)
+                record[name] = int(round(value)) if dtype is int else float(value)
+            records.append(record)
+        return records
+
+    def _write_model(self, disease, models_dir, artifact_format, rng):
+        """Fit a stand-in estimator with the right feature count and save it."""
+        config = ml_utils.DISEASES[disease]
+        schema = config['schema']
+        features = schema.extract_batch(self._random_records(disease, rng, 500))
+        labels = (features[:, 0] > np.median(features[:, 0])).astype(int)
+        model = ESTIMATORS[disease]().fit(features, labels)
+
+        path = os.path.join(models_dir, f"{config['model_name']}.{artifact_format}")
+        if artifact_format == 'joblib':
+            joblib.dump(model, path, compress=0)
+        else:
+            with open(path, 'wb') as file:
+                pickle.dump(model, file)
+
+    def _benchmark(self, disease, rng, iterations, batch_sizes):
+        config = ml_utils.DISEASES[disease]
+        schema = config['schema']
+        threshold = ml_utils.get_threshold(disease)
+        record = self._random_records(disease, rng, 1)[0]
+
+        load_iterations = max(1, iterations // 50)
+        stages = {'load': _summarize(_time_calls(lambda: ml_utils.load_model(config['model_name']), load_iterations))}
+
+        model, version = ml_utils.get_model_entry(config['model_name'])
+        features = schema.extract(record)
+        labels, probabilities = ml_utils.score_features(model, features, threshold)
+
+        stages['featurize'] = _summarize(_time_calls(lambda: schema.extract(record), iterations))
+        stages['infer'] = _summarize(_time_calls(
+            lambda: ml_utils.score_features(model, features, threshold), iterations
+        ))
+        stages['format'] = _summarize(_time_calls(
+            lambda: ml_utils._format_result(labels[0], probabilities[0], config['positive_label'],
+                                            config['negative_label'], version),
+            iterations
+        ))
+
+        batch = {}
+        for size in batch_sizes:
+            records = self._random_records(disease, rng, size)
+            calls = max(1, iterations // size)
+            batch[str(size)] = _summarize(
+                _time_calls(lambda: ml_utils.predict_batch(disease, records), calls), size
+            )
+
+        return {
+            'stages': stages,
+            'single': _summarize(_time_calls(lambda: ml_utils.predict(disease, record), iterations)),
+            'batch': batch,
+        }
+
+    def _rows(self, measures):
+        rows = [(stage, summary) for stage, summary in measures['stages'].items()]
+        rows.append(('single', measures['single']))
+        rows.extend((f'batch {size}', summary) for size, summary in measures['batch'].items())
+        return rows
+
+    def _report(self, results, baseline=None):
+        line = '{:<15} {:<12} {:>10} {:>10} {:>10} {:>14} {:>10}'
+        self.stdout.write(line.format('disease', 'measure', 'p50 ms', 'p95 ms', 'p99 ms', 'rows/s', 'p50 diff'))
+        for disease, measures in results['diseases'].items():
+            previous = {}
+            if baseline and disease in baseline.get('diseases', {}):
+                previous = dict(self._rows(baseline['diseases'][disease]))
+
+            for name, summary in self._rows(measures):
+                diff = ''
+                if name in previous and previous[name]['p50_ms']:
+                    change = (summary['p50_ms'] / previous[name]['p50_ms'] - 1) * 100
+                    diff = f'{change:+.1f}%'
+                self.stdout.write(line.format(
+                    disease, name, summary['p50_ms'], summary['p95_ms'],
+                    summary['p99_ms'], summary['rows_per_second'], diff,
+                ))
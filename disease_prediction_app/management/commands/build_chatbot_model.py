@@ -0,0 +1,68 @@
+import os
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from disease_prediction_app.chatbot_utils import (
+    fit_forest, get_chatbot_model_path, load_or_train, load_training_matrix, read_training_data,
+    split_training,
+)
+
+
+class Command(BaseCommand):
+    help = 'Preprocess Training.csv and train the chatbot symptom classifier for workers to load'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild the training matrix and retrain even if both are up to date',
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Train with and without row deduplication and report time and accuracy',
+        )
+
+    def handle(self, *args, **options):
+        training_path = os.path.join(settings.BASE_DIR, 'chatbot', 'Data', 'Training.csv')
+        start = time.perf_counter()
+        matrix = load_training_matrix(training_path, force=options['force'])
+        artifact = load_or_train(matrix, force=options['force'])
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"Chatbot model {artifact['key'][:12]} ready in {elapsed:.2f}s "
+            f"({len(artifact['label_encoder'].classes_)} diseases, {len(artifact['symptoms_dict'])} symptoms) "
+            f"at {get_chatbot_model_path()}"
+        )
+
+        if options['compare']:
+            self._compare(matrix)
+        self.stdout.write(self.style.SUCCESS('Chatbot model build complete!'))
+
+    def _compare(self, matrix):
+        """Report fit time and accuracy of training on every row versus unique rows."""
+        x_train, x_test, y_train, y_test = split_training(matrix)
+
+        testing_path = os.path.join(settings.BASE_DIR, 'chatbot', 'Data', 'Testing.csv')
+        testing = read_training_data(testing_path)
+        codes = {disease: code for code, disease in enumerate(matrix.diseases)}
+        known = testing['prognosis'].isin(codes)
+        x_eval = testing.loc[known, matrix.columns].to_numpy(dtype=np.uint8)
+        y_eval = testing.loc[known, 'prognosis'].map(codes).to_numpy()
+
+        line = '{:<14} {:>8} {:>10} {:>14} {:>14}'
+        self.stdout.write(line.format('training', 'rows', 'fit s', 'held-out acc', 'Testing.csv acc'))
+        for name, deduplicate in (('all rows', False), ('unique rows', True)):
+            start = time.perf_counter()
+            model = fit_forest(x_train, y_train, deduplicate=deduplicate)
+            fit_seconds = time.perf_counter() - start
+            rows = len(np.unique(np.column_stack([x_train, y_train]), axis=0)) if deduplicate else len(x_train)
+            self.stdout.write(line.format(
+                name, rows, f'{fit_seconds:.2f}',
+                f'{(model.predict(x_test) == y_test).mean():.4f}',
+                f'{(model.predict(x_eval) == y_eval).mean():.4f}',
+            ))
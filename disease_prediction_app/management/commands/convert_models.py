@@ -0,0 +1,51 @@
+import glob
+import os
+import pickle
+
+import joblib
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Convert pickled models in ML_MODELS_PATH to memory-mappable joblib files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Rewrite joblib files that already exist',
+        )
+        parser.add_argument(
+            '--remove-pickle',
+            action='store_true',
+            help='Delete each .pkl file after it has been converted',
+        )
+
+    def handle(self, *args, **options):
+        pickle_paths = sorted(glob.glob(os.path.join(settings.ML_MODELS_PATH, '*.pkl')))
+        if not pickle_paths:
+            self.stdout.write(f'No .pkl files found in {settings.ML_MODELS_PATH}')
+            return
+
+        for pickle_path in pickle_paths:
+            joblib_path = os.path.splitext(pickle_path)[0] + '.joblib'
+            if os.path.exists(joblib_path) and not options['overwrite']:
+                self.stdout.write(f'Skipping {os.path.basename(pickle_path)}: joblib file already exists')
+                continue
+
+            with open(pickle_path, 'rb') as file:
+                model = pickle.load(file)
+
+            # Arrays must be stored uncompressed to be memory-mapped on load. Write
+            # to a temp file and rename it, as truncating a file that running
+            # workers have mapped would crash them on their next page fault.
+            temp_path = f'{joblib_path}.{os.getpid()}.tmp'
+            joblib.dump(model, temp_path, compress=0)
+            os.replace(temp_path, joblib_path)
+            self.stdout.write(f'Converted {os.path.basename(pickle_path)} -> {os.path.basename(joblib_path)}')
+
+            if options['remove_pickle']:
+                os.remove(pickle_path)
+
+        self.stdout.write(self.style.SUCCESS('Model conversion complete!'))
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from disease_prediction_app.linear_scorer import LinearScorer, export_linear_bundle, max_difference, save_bundle
+from disease_prediction_app.ml_utils import DISEASES, file_digest, get_model_path, load_model
+
+
+class Command(BaseCommand):
+    help = 'Export linear disease models as NumPy coefficient bundles scored without sklearn'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--probe-rows',
+            type=int,
+            default=10000,
+            help='Random rows used to check the bundle against sklearn (default: 10000)',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=1e-8,
+            help='Largest allowed difference in probabilities or decision values (default: 1e-8)',
+        )
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(42)
+
+        for disease, config in DISEASES.items():
+            model_name = config['model_name']
+            try:
+                # Hash before loading, so a concurrent retrain leaves the bundle marked stale
+                source = file_digest(get_model_path(model_name, use_bundles=False))
+                estimator = load_model(model_name, use_bundles=False)
+            except FileNotFoundError as e:
+                self.stdout.write(self.style.WARNING(f'Skipping {model_name}: {e}'))
+                continue
+
+            try:
+                bundle = export_linear_bundle(estimator)
+            except ValueError as e:
+                self.stdout.write(self.style.WARNING(f'Skipping {model_name}: {e}'))
+                continue
+
+            # Only write bundles that reproduce sklearn's outputs
+            probe = self._probe_rows(config['schema'], rng, options['probe_rows'])
+            scorer = LinearScorer(bundle)
+            difference = max_difference(estimator, scorer, probe)
+            mismatched = int((estimator.predict(probe) != scorer.predict(probe)).sum())
+            if difference > options['tolerance'] or mismatched:
+                self.stdout.write(self.style.ERROR(
+                    f'Not exporting {model_name}: max difference {difference:.3g}, '
+                    f'{mismatched} mismatched labels'
+                ))
+                continue
+
+            # Record the source artifact, so the bundle is ignored once the model is retrained
+            bundle['source'] = np.array(source)
+            bundle_path = os.path.join(settings.ML_MODELS_PATH, f'{model_name}.linear.npz')
+            save_bundle(bundle, bundle_path)
+            self.stdout.write(
+                f'Exported {model_name} ({bundle["kind"]}) -> {os.path.basename(bundle_path)}, '
+                f'max difference {difference:.3g}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Linear model export complete!'))
+
+    def _probe_rows(self, schema, rng, count):
+        """Random rows spread over, and a little beyond, the valid input ranges."""
+        columns = []
+        for _, _, low, high in schema.fields:
+            low = 0 if low is None else low
+            high = low + 500 if high is None else high
+            margin = (high - low) * 0.1
+            columns.append(rng.uniform(low - margin, high + margin, count))
+        return np.column_stack(columns)
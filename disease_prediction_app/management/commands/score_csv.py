@@ -0,0 +1,79 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from disease_prediction_app.executors import init_worker
+from disease_prediction_app.ml_utils import DISEASES, score_frame
+
+
+class Command(BaseCommand):
+    help = 'Score a patient CSV file in chunks and write the predictions to another CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV file with one patient per row')
+        parser.add_argument('output', help='CSV file to write the scored rows to')
+        parser.add_argument(
+            '--disease',
+            required=True,
+            choices=sorted(DISEASES),
+            help='Which disease model to score with',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Rows read and scored at a time (default: 10000)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Score chunks in a pool of this many processes (default: 1, in-process)',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] <= 0:
+            raise CommandError('--chunk-size must be positive')
+        if not os.path.exists(options['input']):
+            raise CommandError(f"Input file {options['input']} not found")
+
+        disease = options['disease']
+        columns = pd.read_csv(options['input'], nrows=0).columns
+        missing = [name for name in DISEASES[disease]['schema'].names if name not in columns]
+        if missing:
+            raise CommandError(f"Input is missing columns: {', '.join(missing)}")
+
+        chunks = pd.read_csv(options['input'], chunksize=options['chunk_size'])
+        rows = invalid = 0
+        with open(options['output'], 'w', newline='') as output:
+            header = True
+            for scored in self._score_chunks(disease, chunks, options['workers']):
+                scored.to_csv(output, header=header, index=False)
+                header = False
+                rows += len(scored)
+                invalid += int((scored['prediction'] == '').sum())
+                self.stdout.write(f'Scored {rows} rows...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {rows} scored rows to {options['output']} ({invalid} rows could not be scored)"
+        ))
+
+    def _score_chunks(self, disease, chunks, workers):
+        """Yield scored chunks in input order, keeping at most a few in flight."""
+        if workers <= 1:
+            for chunk in chunks:
+                yield score_frame(disease, chunk)
+            return
+
+        # Submit lazily so only a bounded number of chunks are held in memory
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+            for chunk in chunks:
+                pending.append(executor.submit(score_frame, disease, chunk))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
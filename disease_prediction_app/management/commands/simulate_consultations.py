@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from disease_prediction_app.chatbot_utils import get_chatbot, read_training_data
+from disease_prediction_app.views import _chatbot_reply, _new_chatbot_session
+
+
+class Command(BaseCommand):
+    help = 'Replay Testing.csv as chatbot consultations and compare follow-up question strategies'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--initial-symptoms',
+            type=int,
+            default=2,
+            help='Symptoms each simulated patient mentions in the first message (default: 2)',
+        )
+        parser.add_argument(
+            '--repeats',
+            type=int,
+            default=5,
+            help='Consultations per Testing.csv row, each starting from different symptoms (default: 5)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for choosing the initial symptoms (default: 42)',
+        )
+
+    def handle(self, *args, **options):
+        chatbot = get_chatbot()
+        if chatbot.forest is None:
+            self.stderr.write(self.style.ERROR('The chatbot model could not be loaded'))
+            return
+
+        testing = read_training_data(os.path.join(settings.BASE_DIR, 'chatbot', 'Data', 'Testing.csv'))
+        rng = np.random.default_rng(options['seed'])
+        patients = []
+        for _, row in testing.iterrows():
+            symptoms = [symptom for symptom in chatbot.symptom_names if row.get(symptom) == 1]
+            for _ in range(options['repeats']):
+                count = min(options['initial_symptoms'], len(symptoms))
+                initial = list(rng.choice(symptoms, count, replace=False))
+                patients.append((row['prognosis'], set(symptoms), initial))
+
+        planner = dict(getattr(settings, 'CHATBOT_QUESTION_PLANNER', {}))
+        line = '{:<22} {:>14} {:>16} {:>10}'
+        self.stdout.write(line.format('strategy', 'consultations', 'requests (mean)', 'accuracy'))
+        for name, enabled in (('related symptoms', False), ('information gain', True)):
+            with override_settings(CHATBOT_QUESTION_PLANNER=dict(planner, ENABLED=enabled)):
+                requests, correct = self._run(patients)
+            self.stdout.write(line.format(
+                name, len(patients), f'{np.mean(requests):.2f}', f'{np.mean(correct):.4f}'
+            ))
+
+    def _run(self, patients):
+        """Hold every consultation through the chatbot view logic, answering truthfully."""
+        requests, correct = [], []
+        for disease, symptoms, initial in patients:
+            session_data = _new_chatbot_session()
+            message = 'I have ' + ' and '.join(symptom.replace('_', ' ') for symptom in initial)
+            response, session_data = _chatbot_reply(message, session_data)
+            count = 1
+            while session_data['conversation_stage'] == 'symptoms_confirmed':
+                asked = session_data['related_symptoms'][session_data['current_question']]
+                response, session_data = _chatbot_reply('yes' if asked in symptoms else 'no', session_data)
+                count += 1
+            requests.append(count)
+            correct.append(session_data['current_disease'] == disease)
+        return requests, correct
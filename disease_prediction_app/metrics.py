@@ -0,0 +1,277 @@
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    @staticmethod
+    def merge(total, value):
+        return (total or 0) + value
+
+    def render(self, samples):
+        lines = []
+        for key, value in samples:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the enclosed block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels):
+        """Decorator observing the duration of every call in seconds."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self._values.items()]
+
+    @staticmethod
+    def merge(total, value):
+        if total is None:
+            return [list(value[0]), value[1], value[2]]
+        return [[a + b for a, b in zip(total[0], value[0])], total[1] + value[1], total[2] + value[2]]
+
+    def render(self, samples):
+        lines = []
+        for key, (counts, total, count) in samples:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, ("le", repr(bound)))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, ("le", "+Inf"))} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {count}')
+        return lines
+
+
+def _register(metric):
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name, help_text, labelnames=()):
+    """Return the process-wide counter with this name, creating it on first use."""
+    return _register(Counter(name, help_text, labelnames))
+
+
+def histogram(name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+    """Return the process-wide histogram with this name, creating it on first use."""
+    return _register(Histogram(name, help_text, labelnames, buckets))
+
+
+def snapshot():
+    """Return this process's metric values in a JSON-serializable form."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return {metric.name: metric.snapshot() for metric in metrics}
+
+
+# Multi-worker aggregation: when METRICS_DIR is set, each process writes its
+# snapshot to its own file and /metrics sums the files of all workers.
+
+_flush_thread = None
+
+
+def _snapshot_path(pid=None):
+    return os.path.join(settings.METRICS_DIR, f'metrics_{pid or os.getpid()}.json')
+
+
+def flush():
+    """Write this process's snapshot to METRICS_DIR, if configured."""
+    metrics_dir = getattr(settings, 'METRICS_DIR', None)
+    if not metrics_dir:
+        return
+    os.makedirs(metrics_dir, exist_ok=True)
+    path = _snapshot_path()
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(snapshot(), file)
+    os.replace(temp_path, path)
+
+
+def _flush_periodically(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except OSError as e:
+            print(f"Error writing metrics snapshot: {e}")
+
+
+def start_flushing():
+    """Start the background thread that writes snapshots for other workers to read."""
+    global _flush_thread
+    if not getattr(settings, 'METRICS_DIR', None) or _flush_thread is not None:
+        return
+    with _registry_lock:
+        if _flush_thread is None:
+            interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+            _flush_thread = threading.Thread(target=_flush_periodically, args=(interval,),
+                                             name='metrics-flush', daemon=True)
+            _flush_thread.start()
+
+
+def _reset_after_fork():
+    """Start a forked worker with empty metrics, fresh locks and its own flush thread.
+
+    The parent keeps reporting what it counted before the fork, so the child
+    must not report those values again.
+    """
+    global _registry_lock, _flush_thread
+    _registry_lock = threading.Lock()
+    for metric in _registry.values():
+        metric._values = {}
+        metric._lock = threading.Lock()
+
+    flushing = _flush_thread is not None
+    _flush_thread = None
+    if flushing:
+        start_flushing()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _collect():
+    """Return merged samples of every known metric across all workers."""
+    local = snapshot()
+    if not getattr(settings, 'METRICS_DIR', None):
+        return local
+
+    flush()
+    merged = {}
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, 'metrics_*.json')):
+        # Drop snapshots left behind by workers that have exited
+        pid = os.path.basename(path)[len('metrics_'):-len('.json')]
+        if pid.isdigit() and not _is_running(int(pid)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path) as file:
+                worker_snapshot = json.load(file)
+        except (OSError, ValueError):
+            continue
+        for name, samples in worker_snapshot.items():
+            metric = _registry.get(name)
+            if metric is None:
+                continue
+            totals = merged.setdefault(name, {})
+            for key, value in samples:
+                totals[tuple(key)] = metric.merge(totals.get(tuple(key)), value)
+    return {name: [[list(key), value] for key, value in totals.items()] for name, totals in merged.items()}
+
+
+def render():
+    """Render all metrics in the Prometheus text exposition format."""
+    samples = _collect()
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda metric: metric.name)
+
+    lines = []
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.render(samples.get(metric.name, [])))
+    return '\n'.join(lines) + '\n'
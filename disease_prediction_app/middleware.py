@@ -0,0 +1,40 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+from . import metrics
+
+
+_requests_total = metrics.counter(
+    'http_requests_total', 'Requests handled, by view, method and status', ('view', 'method', 'status'))
+_request_seconds = metrics.histogram(
+    'http_request_duration_seconds', 'Time spent handling a request', ('view',))
+
+
+def _record(request, response, start):
+    match = getattr(request, 'resolver_match', None)
+    view = match.url_name if match is not None and match.url_name else 'unmatched'
+    _request_seconds.observe(time.perf_counter() - start, view=view)
+    _requests_total.inc(view=view, method=request.method, status=response.status_code)
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """Record request counts and latencies per view for /metrics."""
+    metrics.start_flushing()
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            start = time.perf_counter()
+            response = await get_response(request)
+            _record(request, response, start)
+            return response
+        markcoroutinefunction(middleware)
+    else:
+        def middleware(request):
+            start = time.perf_counter()
+            response = get_response(request)
+            _record(request, response, start)
+            return response
+    return middleware
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('disease_prediction_app', '0002_prediction_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShadowPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('disease_type', models.CharField(choices=[('diabetes', 'Diabetes'), ('heart_disease', 'Heart Disease'), ('parkinsons', "Parkinson's Disease")], max_length=50)),
+                ('features', models.JSONField()),
+                ('primary_model_version', models.CharField(blank=True, max_length=64)),
+                ('primary_result', models.CharField(max_length=100)),
+                ('primary_probability', models.FloatField()),
+                ('primary_latency_ms', models.FloatField()),
+                ('shadow_model_name', models.CharField(max_length=100)),
+                ('shadow_model_version', models.CharField(blank=True, max_length=64)),
+                ('shadow_result', models.CharField(max_length=100)),
+                ('shadow_probability', models.FloatField()),
+                ('shadow_latency_ms', models.FloatField()),
+                ('agrees', models.BooleanField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
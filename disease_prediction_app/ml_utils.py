@@ -1,13 +1,128 @@
+import hashlib
+import json
 import pickle
+import joblib
+import sys
+import threading
+import time
 import numpy as np
+import pandas as pd
 from django.conf import settings
+from django.db import transaction
 import os
+from .features import SCHEMAS
+from .cache_utils import build_cache
+from .linear_scorer import LinearScorer
+from .batching import MicroBatcher
+from .executors import get_prediction_executor
+from . import metrics
 
 
-def load_model(model_name):
-    """Load a pickle model from the ml_models directory."""
-    model_path = os.path.join(settings.ML_MODELS_PATH, f"{model_name}.pkl")
+# Process-wide model registry: each model is unpickled once per worker and
+# then served from memory to every predictor. Entries are replaced as a
+# whole when a changed artifact is reloaded.
+_model_registry = {}
+_model_stats = {}
+_reloading = set()
+_registry_lock = threading.Lock()
+_load_locks = {}
+
+# Bounded cache of recent results, created on first use from PREDICTION_CACHE
+_prediction_cache = None
+
+# One micro-batcher per disease, created on first use from MICRO_BATCHING
+_batchers = {}
+
+_predictions_total = metrics.counter(
+    'prediction_rows_total', 'Rows predicted, by disease and whether the result came from the cache',
+    ('disease', 'source'))
+_inference_seconds = metrics.histogram(
+    'prediction_inference_seconds', 'Time spent scoring features with the model',
+    ('disease', 'mode'))
+_model_loads_total = metrics.counter(
+    'model_loads_total', 'Model artifacts loaded from disk', ('model',))
+_model_load_seconds = metrics.histogram(
+    'model_load_seconds', 'Time spent loading a model artifact', ('model',))
+_micro_batch_rows = metrics.histogram(
+    'micro_batch_rows', 'Rows merged into each micro-batch', ('disease',),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+
+
+def _reset_locks_after_fork():
+    """Give a forked worker fresh locks, as a parent thread may have held them mid-load.
+
+    Micro-batchers and the result cache are dropped too: their threads and
+    locks belong to the parent, so the child builds its own on first use.
+    """
+    global _registry_lock, _load_locks, _batchers, _prediction_cache
+    _registry_lock = threading.Lock()
+    _load_locks = {}
+    _reloading.clear()
+    _batchers = {}
+    _prediction_cache = None
+
+
+os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+def _source_path(model_name):
+    """Return the newer of a model's joblib and pickle files."""
+    model_path, newest = None, None
+    for extension in ('joblib', 'pkl'):
+        path = os.path.join(settings.ML_MODELS_PATH, f"{model_name}.{extension}")
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        # On a tie the joblib file wins, as it is the memory-mappable format
+        if newest is None or mtime > newest:
+            model_path, newest = path, mtime
+    return model_path or os.path.join(settings.ML_MODELS_PATH, f"{model_name}.pkl")
+
+
+def _bundle_is_current(bundle_path, source_path):
+    """Return whether a linear bundle was exported from the current source artifact."""
+    if not os.path.exists(source_path):
+        return True
+    try:
+        source = LinearScorer.read_source(bundle_path)
+    except (OSError, ValueError) as e:
+        print(f"Error reading linear bundle {bundle_path}: {e}")
+        return False
+    return source == file_digest(source_path)
+
+
+def get_model_path(model_name, use_bundles=True):
+    """Return the artifact path for a model.
+
+    Exported linear bundles are preferred while they still match the model
+    they were exported from. Otherwise the newer of the joblib and pickle
+    files is used, so a retrained .pkl dropped next to an older converted
+    .joblib is picked up instead of being shadowed by it.
+    """
+    source_path = _source_path(model_name)
+    if use_bundles and getattr(settings, 'ML_MODELS_USE_LINEAR_BUNDLES', True):
+        bundle_path = os.path.join(settings.ML_MODELS_PATH, f"{model_name}.linear.npz")
+        if os.path.exists(bundle_path) and _bundle_is_current(bundle_path, source_path):
+            return bundle_path
+    return source_path
+
+
+def load_model(model_name, use_bundles=True):
+    """Load a model from the ml_models directory.
+
+    Linear bundles written by export_linear_models are scored with plain
+    NumPy. Joblib artifacts are opened with memory-mapped numpy arrays so
+    that the weights of every worker on a node share the same page cache.
+    Plain pickle files are still supported for models that were not converted.
+    """
+    model_path = get_model_path(model_name, use_bundles)
     try:
+        if model_path.endswith('.linear.npz'):
+            return LinearScorer.load(model_path)
+        if model_path.endswith('.joblib'):
+            mmap_mode = getattr(settings, 'ML_MODELS_MMAP_MODE', 'c')
+            return joblib.load(model_path, mmap_mode=mmap_mode)
         with open(model_path, 'rb') as file:
             model = pickle.load(file)
         return model
@@ -17,165 +132,496 @@ def load_model(model_name):
         raise Exception(f"Error loading model {model_name}: {str(e)}")
 
 
-def predict_diabetes(data):
-    """Predict diabetes using the diabetes model."""
-    model = load_model('diabetes_model2')
-    
-    # Convert input data to numpy array
-    # features = np.array([
-    #     data['pregnancies'],
-    #     data['glucose'],
-    #     data['blood_pressure'],
-    #     data['skin_thickness'],
-    #     data['insulin'],
-    #     data['bmi'],
-    #     data['diabetes_pedigree_function'],
-    #     data['age']
-    # ]).reshape(1, -1)
-    features = np.array([
-    int(data['pregnancies']),                   
-    float(data['glucose']),                    
-    float(data['blood_pressure']),              
-    float(data['skin_thickness']),             
-    float(data['insulin']),                     
-    float(data['bmi']),                         
-    float(data['diabetes_pedigree_function']),   
-    int(data['age'])                            
-    ]).reshape(1, -1)
-
-    
-    # Make prediction
-    prediction = model.predict(features)[0]
-    probability = model.predict_proba(features)[0]
-    
-    result = "Diabetic" if prediction == 1 else "Non-Diabetic"
-    confidence = max(probability) * 100
-    
+def _estimate_nbytes(obj, seen=None):
+    """Approximate the resident size of a fitted estimator in bytes."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_estimate_nbytes(k, seen) + _estimate_nbytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_estimate_nbytes(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += _estimate_nbytes(vars(obj), seen)
+    return size
+
+
+def _read_manifest():
+    """Return the model versions declared in ML_MODELS_PATH/manifest.json, if any."""
+    manifest_path = os.path.join(settings.ML_MODELS_PATH, 'manifest.json')
+    try:
+        with open(manifest_path) as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _artifact_signature(model_name):
+    """Return a cheap fingerprint of a model artifact used to detect changes."""
+    model_path = get_model_path(model_name)
+    try:
+        stat = os.stat(model_path)
+    except FileNotFoundError:
+        return None
+    return (model_path, stat.st_mtime_ns, stat.st_size, _read_manifest().get(model_name))
+
+
+# sha256 of artifacts keyed on path, rehashed only when mtime or size changes
+_digests = {}
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of a model artifact."""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _digests.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    _digests[path] = (key, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def _artifact_version(model_name, signature):
+    """Return the manifest version of a model, or a hash of its artifact."""
+    model_path, _, _, manifest_version = signature
+    if manifest_version:
+        return str(manifest_version)
+    return file_digest(model_path)[:12]
+
+
+def _load_entry(model_name):
+    """Load a model from disk and build its registry entry and stats."""
+    signature = _artifact_signature(model_name)
+    start = time.perf_counter()
+    model = load_model(model_name)
+    load_seconds = time.perf_counter() - start
+    load_time_ms = round(load_seconds * 1000, 2)
+    _model_loads_total.inc(model=model_name)
+    _model_load_seconds.observe(load_seconds, model=model_name)
+
+    version = _artifact_version(model_name, signature) if signature else ''
+    entry = {
+        'model': model,
+        'version': version,
+        'signature': signature,
+        'checked_at': time.monotonic(),
+    }
+    stats = {
+        'version': version,
+        'load_time_ms': load_time_ms,
+        'memory_bytes': _estimate_nbytes(model),
+        'format': os.path.splitext(get_model_path(model_name))[1].lstrip('.'),
+        'loaded_at': time.time(),
+    }
+    return entry, stats
+
+
+def _reload_model(model_name):
+    """Load a changed artifact in the background and swap it in atomically."""
+    try:
+        entry, stats = _load_entry(model_name)
+    except Exception as e:
+        print(f"Error reloading model {model_name}: {e}")
+    else:
+        with _registry_lock:
+            # Requests already holding the old model keep using it until they finish
+            _model_registry[model_name] = entry
+            _model_stats[model_name] = stats
+    finally:
+        with _registry_lock:
+            _reloading.discard(model_name)
+
+
+def _check_for_update(model_name, entry):
+    """Start a background reload if the model artifact changed on disk."""
+    interval = getattr(settings, 'ML_MODELS_RELOAD_INTERVAL', 0)
+    now = time.monotonic()
+    if not interval or now - entry['checked_at'] < interval:
+        return
+
+    entry['checked_at'] = now
+    signature = _artifact_signature(model_name)
+    if signature is None or signature == entry['signature']:
+        return
+
+    with _registry_lock:
+        if model_name in _reloading:
+            return
+        _reloading.add(model_name)
+    threading.Thread(target=_reload_model, args=(model_name,),
+                     name=f'reload-{model_name}', daemon=True).start()
+
+
+def get_model_entry(model_name):
+    """Return (model, version) from the registry, loading it on first use.
+
+    Fetch both together so a prediction always records the version of the
+    model that actually produced it, even while a reload is swapping models.
+    """
+    entry = _model_registry.get(model_name)
+    if entry is None:
+        # Load under a per-model lock, so stats reads and other models never wait on disk
+        with _registry_lock:
+            load_lock = _load_locks.setdefault(model_name, threading.Lock())
+        with load_lock:
+            # Another thread may have loaded it while we waited for the lock
+            entry = _model_registry.get(model_name)
+            if entry is None:
+                entry, stats = _load_entry(model_name)
+                with _registry_lock:
+                    _model_registry[model_name] = entry
+                    _model_stats[model_name] = stats
+    else:
+        _check_for_update(model_name, entry)
+    return entry['model'], entry['version']
+
+
+def get_model(model_name):
+    """Return a model from the registry, loading it on first use."""
+    return get_model_entry(model_name)[0]
+
+
+def get_model_stats():
+    """Return version, load time and memory usage for every loaded model."""
+    with _registry_lock:
+        return {name: dict(stats) for name, stats in _model_stats.items()}
+
+
+def clear_model_registry():
+    """Drop all cached models so the next prediction reloads them from disk."""
+    with _registry_lock:
+        _model_registry.clear()
+        _model_stats.clear()
+
+
+# Model name, feature schema and result labels for each Prediction.disease_type.
+DISEASES = {
+    'diabetes': {
+        'model_name': 'diabetes_model2',
+        'schema': SCHEMAS['diabetes'],
+        'positive_label': "Diabetic",
+        'negative_label': "Non-Diabetic",
+    },
+    'heart_disease': {
+        'model_name': 'heart_disease_model',
+        'schema': SCHEMAS['heart_disease'],
+        'positive_label': "Heart Disease",
+        'negative_label': "No Heart Disease",
+    },
+    'parkinsons': {
+        'model_name': 'parkinsons_model2',
+        'schema': SCHEMAS['parkinsons'],
+        'positive_label': "Parkinson's Disease",
+        'negative_label': "No Parkinson's Disease",
+    },
+}
+
+
+def get_threshold(disease_type):
+    """Return the positive-class probability threshold for a disease."""
+    thresholds = getattr(settings, 'PREDICTION_THRESHOLDS', {})
+    return thresholds.get(disease_type, 0.5)
+
+
+def score_features(model, features, threshold=0.5):
+    """Run the model once and derive labels and class probabilities from it.
+
+    Returns an array of 0/1 labels and an (n_rows, 2) array holding the
+    negative and positive class probabilities. Models without predict_proba
+    are scored through decision_function squashed by a logistic curve.
+    """
+    if hasattr(model, 'predict_proba'):
+        probabilities = model.predict_proba(features)
+        classes = list(getattr(model, 'classes_', [0, 1]))
+        positive = probabilities[:, classes.index(1)]
+    else:
+        scores = np.asarray(model.decision_function(features), dtype=np.float64)
+        positive = 1.0 / (1.0 + np.exp(-scores))
+
+    labels = (positive > threshold).astype(np.int64)
+    return labels, np.column_stack([1.0 - positive, positive])
+
+
+def _format_result(prediction, probability, positive_label, negative_label, model_version=''):
+    """Shape one model output row into the dict the views and templates expect."""
+    result = positive_label if prediction == 1 else negative_label
+    # Confidence is the probability of the reported class, which with a
+    # non-default threshold is not necessarily the larger of the two
+    confidence = (probability[1] if prediction == 1 else probability[0]) * 100
+
     return {
         'prediction': result,
         'confidence': round(confidence, 2),
         'probability_positive': round(probability[1] * 100, 2),
-        'probability_negative': round(probability[0] * 100, 2)
+        'probability_negative': round(probability[0] * 100, 2),
+        'model_version': model_version
     }
 
 
-def predict_heart_disease(data):
-    """Predict heart disease using the heart disease model."""
-    model = load_model('heart_disease_model')
-    
-    # Convert input data to numpy array
-    # features = np.array([
-    #     data['age'],
-    #     data['sex'],
-    #     data['cp'],
-    #     data['trestbps'],
-    #     data['chol'],
-    #     data['fbs'],
-    #     data['restecg'],
-    #     data['thalach'],
-    #     data['exang'],
-    #     data['oldpeak'],
-    #     data['slope'],
-    #     data['ca'],
-    #     data['thal']
-    # ]).reshape(1, -1)
-    features = np.array([
-    int(data['age']),
-    int(data['sex']),
-    int(data['cp']),
-    float(data['trestbps']),
-    float(data['chol']),
-    int(data['fbs']),
-    int(data['restecg']),
-    float(data['thalach']),
-    int(data['exang']),
-    float(data['oldpeak']),
-    int(data['slope']),
-    int(data['ca']),
-    int(data['thal'])
-    ]).reshape(1, -1)
-
-    
-    # Make prediction
-    prediction = model.predict(features)[0]
-    probability = model.predict_proba(features)[0]
-    
-    result = "Heart Disease" if prediction == 1 else "No Heart Disease"
-    confidence = max(probability) * 100
-    
+def _score_batch(disease_type, features):
+    """Score a micro-batch and return (label, probabilities, model version) per row."""
+    model, version = get_model_entry(DISEASES[disease_type]['model_name'])
+    _micro_batch_rows.observe(len(features), disease=disease_type)
+    labels, probabilities = score_features(model, features, get_threshold(disease_type))
+    return [(label, probability, version) for label, probability in zip(labels, probabilities)]
+
+
+def get_batcher(disease_type):
+    """Return the micro-batcher for a disease, or None if micro-batching is disabled."""
+    config = getattr(settings, 'MICRO_BATCHING', {})
+    if not config.get('ENABLED', False):
+        return None
+
+    batcher = _batchers.get(disease_type)
+    if batcher is None:
+        with _registry_lock:
+            batcher = _batchers.get(disease_type)
+            if batcher is None:
+                batcher = MicroBatcher(
+                    lambda features: _score_batch(disease_type, features),
+                    max_batch_size=config.get('MAX_BATCH_SIZE', 32),
+                    max_wait_ms=config.get('MAX_WAIT_MS', 2),
+                    timeout_ms=config.get('TIMEOUT_MS', 1000),
+                    name=f'micro-batcher-{disease_type}',
+                )
+                _batchers[disease_type] = batcher
+    return batcher
+
+
+def get_batcher_stats():
+    """Return batch-size and queue-wait metrics for every active micro-batcher."""
+    return {disease_type: batcher.stats() for disease_type, batcher in list(_batchers.items())}
+
+
+def get_prediction_cache():
+    """Return the shared prediction result cache, or None if it is disabled."""
+    global _prediction_cache
+    config = getattr(settings, 'PREDICTION_CACHE', {})
+    if config.get('MAX_SIZE', 1024) <= 0:
+        return None
+    if _prediction_cache is None:
+        with _registry_lock:
+            if _prediction_cache is None:
+                _prediction_cache = build_cache(config, key_prefix='prediction:')
+    return _prediction_cache
+
+
+def predict(disease_type, data):
+    """Predict a single record for the given disease type."""
+    config = DISEASES[disease_type]
+    model, version = get_model_entry(config['model_name'])
+    features = config['schema'].extract(data)
+    config['schema'].validate(features)
+    threshold = get_threshold(disease_type)
+
+    # Identical inputs scored by the same model version give the same result
+    cache = get_prediction_cache()
+    if cache is not None:
+        cache_key = (disease_type, version, threshold, features.tobytes())
+        result = cache.get(cache_key)
+        if result is not None:
+            _predictions_total.inc(disease=disease_type, source='cache')
+            return dict(result)
+
+    # Make prediction, merged with concurrent requests when micro-batching is on
+    start = time.perf_counter()
+    batcher = get_batcher(disease_type)
+    scored = None
+    if batcher is not None:
+        try:
+            scored = batcher.submit(features)
+        except TimeoutError as e:
+            print(f"Scoring {disease_type} row directly: {e}")
+    if scored is None:
+        labels, probabilities = score_features(model, features, threshold)
+        scored = labels[0], probabilities[0], version
+    label, probability, scored_version = scored
+    latency_ms = (time.perf_counter() - start) * 1000
+    _inference_seconds.observe(latency_ms / 1000, disease=disease_type, mode='single')
+    _predictions_total.inc(disease=disease_type, source='model')
+
+    result = _format_result(label, probability,
+                            config['positive_label'], config['negative_label'], scored_version)
+
+    # Let a candidate model score the same row in the background
+    if disease_type in getattr(settings, 'SHADOW_MODELS', {}):
+        from .shadow import submit_shadow
+        submit_shadow(disease_type, features, result, latency_ms)
+    # A reload may have swapped the model while the row sat in the batch queue
+    if cache is not None and scored_version == version:
+        cache.set(cache_key, result)
+        result = dict(result)
+    return result
+
+
+def predict_batch(disease_type, records, user=None):
+    """Predict many records for the given disease type with one model call.
+
+    When a user is given the results are also saved as Prediction rows.
+    """
+    if len(records) == 0:
+        return []
+
+    config = DISEASES[disease_type]
+    model, version = get_model_entry(config['model_name'])
+    features = config['schema'].extract_batch(records)
+    config['schema'].validate(features)
+
+    with _inference_seconds.time(disease=disease_type, mode='batch'):
+        labels, probabilities = score_features(model, features, get_threshold(disease_type))
+    _predictions_total.inc(len(features), disease=disease_type, source='model')
+    results = [
+        _format_result(label, probability,
+                       config['positive_label'], config['negative_label'], version)
+        for label, probability in zip(labels, probabilities)
+    ]
+
+    if user is not None:
+        save_predictions(user, disease_type, records, results)
+    return results
+
+
+def screening_inputs(payload):
+    """Split a screening payload into one record per disease.
+
+    Each disease reads its fields from a nested object under its
+    disease_type key when present, or else from the top-level payload, so
+    shared fields such as age only need to be sent once.
+    """
     return {
-        'prediction': result,
-        'confidence': round(confidence, 2),
-        'probability_positive': round(probability[1] * 100, 2),
-        'probability_negative': round(probability[0] * 100, 2)
+        disease_type: payload[disease_type] if isinstance(payload.get(disease_type), dict) else payload
+        for disease_type in DISEASES
+    }
+
+
+def predict_screening(payload, user=None):
+    """Score all diseases for one patient concurrently.
+
+    Total latency is close to the slowest model rather than the sum of all
+    of them. When a user is given, the results are saved as Prediction rows
+    in a single transaction.
+    """
+    inputs = screening_inputs(payload)
+    executor = get_prediction_executor()
+    futures = {
+        disease_type: executor.submit(predict, disease_type, data)
+        for disease_type, data in inputs.items()
     }
+    results = {disease_type: future.result() for disease_type, future in futures.items()}
+
+    if user is not None:
+        from .models import Prediction
+
+        with transaction.atomic():
+            Prediction.objects.bulk_create([
+                Prediction(
+                    user=user,
+                    disease_type=disease_type,
+                    prediction_result=result['prediction'],
+                    confidence_score=result['confidence'],
+                    model_version=result.get('model_version', ''),
+                    input_data={name: _to_json_value(inputs[disease_type][name])
+                                for name in DISEASES[disease_type]['schema'].names}
+                )
+                for disease_type, result in results.items()
+            ])
+    return results
+
+
+def score_frame(disease_type, frame):
+    """Score a DataFrame and return a copy with the result columns appended.
+
+    Rows with missing or out-of-range values are not scored; their
+    prediction column holds an empty string and the error column says why.
+    """
+    config = DISEASES[disease_type]
+    schema = config['schema']
+    model, version = get_model_entry(config['model_name'])
+
+    features = schema.extract_batch(frame)
+    valid = np.ones(len(frame), dtype=bool)
+    valid[schema.invalid_rows(features)] = False
+
+    labels = np.zeros(len(frame), dtype=np.int64)
+    probabilities = np.full((len(frame), 2), np.nan)
+    if valid.any():
+        labels[valid], probabilities[valid] = score_features(
+            model, features[valid], get_threshold(disease_type)
+        )
+
+    result = frame.copy()
+    result['prediction'] = np.where(
+        valid, np.where(labels == 1, config['positive_label'], config['negative_label']), ''
+    )
+    result['confidence'] = np.round(np.where(labels == 1, probabilities[:, 1], probabilities[:, 0]) * 100, 2)
+    result['probability_positive'] = np.round(probabilities[:, 1] * 100, 2)
+    result['probability_negative'] = np.round(probabilities[:, 0] * 100, 2)
+    result['model_version'] = version
+    result['error'] = np.where(valid, '', 'missing or out-of-range value')
+    return result
+
+
+def _to_json_value(value):
+    """Convert numpy scalars to plain Python values for JSONField storage."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def save_predictions(user, disease_type, records, results):
+    """Persist a batch of predictions with a single bulk insert."""
+    if isinstance(records, pd.DataFrame):
+        records = records.to_dict('records')
+
+    from .models import Prediction
+
+    return Prediction.objects.bulk_create([
+        Prediction(
+            user=user,
+            disease_type=disease_type,
+            prediction_result=result['prediction'],
+            confidence_score=result['confidence'],
+            model_version=result.get('model_version', ''),
+            input_data={key: _to_json_value(value) for key, value in data.items()}
+        )
+        for data, result in zip(records, results)
+    ])
+
+
+def predict_diabetes(data):
+    """Predict diabetes using the diabetes model."""
+    return predict('diabetes', data)
+
+
+def predict_heart_disease(data):
+    """Predict heart disease using the heart disease model."""
+    return predict('heart_disease', data)
 
 
 def predict_parkinsons(data):
     """Predict Parkinson's disease using the Parkinson's model."""
-    model = load_model('parkinsons_model2')
-    
-    # Convert input data to numpy array
-    # features = np.array([
-    #     data['fo'],
-    #     data['fhi'],
-    #     data['flo'],
-    #     data['jitter_percent'],
-    #     data['jitter_abs'],
-    #     data['rap'],
-    #     data['ppq'],
-    #     data['ddp'],
-    #     data['shimmer'],
-    #     data['shimmer_db'],
-    #     data['apq3'],
-    #     data['apq5'],
-    #     data['apq'],
-    #     data['dda'],
-    #     data['nhr'],
-    #     data['hnr'],
-    #     data['rpde'],
-    #     data['dfa'],
-    #     data['spread1'],
-    #     data['spread2'],
-    #     data['d2'],
-    #     data['ppe']
-    # ]).reshape(1, -1)
-    features = np.array([
-    float(data['fo']),
-    float(data['fhi']),
-    float(data['flo']),
-    float(data['jitter_percent']),
-    float(data['jitter_abs']),
-    float(data['rap']),
-    float(data['ppq']),
-    float(data['ddp']),
-    float(data['shimmer']),
-    float(data['shimmer_db']),
-    float(data['apq3']),
-    float(data['apq5']),
-    float(data['apq']),
-    float(data['dda']),
-    float(data['nhr']),
-    float(data['hnr']),
-    float(data['rpde']),
-    float(data['dfa']),
-    float(data['spread1']),
-    float(data['spread2']),
-    float(data['d2']),
-    float(data['ppe'])
-    ]).reshape(1, -1)
-
-    
-    # Make prediction
-    prediction = model.predict(features)[0]
-    probability = model.predict_proba(features)[0]
-    
-    result = "Parkinson's Disease" if prediction == 1 else "No Parkinson's Disease"
-    confidence = max(probability) * 100
-    
-    return {
-        'prediction': result,
-        'confidence': round(confidence, 2),
-        'probability_positive': round(probability[1] * 100, 2),
-        'probability_negative': round(probability[0] * 100, 2)
-    }
+    return predict('parkinsons', data)
+
+
+def predict_diabetes_batch(records, user=None):
+    """Predict diabetes for a list of records or a DataFrame."""
+    return predict_batch('diabetes', records, user)
+
+
+def predict_heart_disease_batch(records, user=None):
+    """Predict heart disease for a list of records or a DataFrame."""
+    return predict_batch('heart_disease', records, user)
+
+
+def predict_parkinsons_batch(records, user=None):
+    """Predict Parkinson's disease for a list of records or a DataFrame."""
+    return predict_batch('parkinsons', records, user)
@@ -64,6 +64,7 @@ class Prediction(models.Model):
     prediction_result = models.CharField(max_length=100)
     confidence_score = models.FloatField()
     input_data = models.JSONField()  # Store the input parameters used for prediction
+    model_version = models.CharField(max_length=64, blank=True)  # Model artifact that produced the result
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -92,6 +93,29 @@ class Prediction(models.Model):
         ordering = ['-created_at']
 
 
+class ShadowPrediction(models.Model):
+    """Result of a candidate model scoring the same input as the live model."""
+    disease_type = models.CharField(max_length=50, choices=Prediction.DISEASE_CHOICES)
+    features = models.JSONField()  # Feature vector both models scored
+    primary_model_version = models.CharField(max_length=64, blank=True)
+    primary_result = models.CharField(max_length=100)
+    primary_probability = models.FloatField()
+    primary_latency_ms = models.FloatField()
+    shadow_model_name = models.CharField(max_length=100)
+    shadow_model_version = models.CharField(max_length=64, blank=True)
+    shadow_result = models.CharField(max_length=100)
+    shadow_probability = models.FloatField()
+    shadow_latency_ms = models.FloatField()
+    agrees = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.disease_type} - {self.shadow_model_name} - {'agrees' if self.agrees else 'disagrees'}"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
 class ContactMessage(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField()
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+def _entropy(probabilities, axis=0):
+    """Shannon entropy in bits along axis, treating 0 * log 0 as 0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+    return -terms.sum(axis=axis)
+
+
+class QuestionPlanner:
+    """Picks the follow-up symptom whose answer is expected to tell the most.
+
+    Keeps naive Bayes statistics of the training data: disease priors and
+    the smoothed probability of each symptom given each disease. Answers so
+    far give a posterior over diseases; the next question is the unasked
+    symptom with the highest expected information gain about the disease.
+    """
+
+    def __init__(self, symptoms, labels, n_diseases, smoothing=1.0):
+        symptoms = np.asarray(symptoms, dtype=np.float64)
+        labels = np.asarray(labels)
+        counts = np.bincount(labels, minlength=n_diseases).astype(np.float64)
+
+        present = np.zeros((n_diseases, symptoms.shape[1]))
+        np.add.at(present, labels, symptoms)
+        self.log_prior = np.log(counts / counts.sum())
+        self.likelihood = (present + smoothing) / (counts[:, None] + 2 * smoothing)
+        self.log_yes = np.log(self.likelihood)
+        self.log_no = np.log1p(-self.likelihood)
+
+    def posterior(self, present, absent):
+        """Posterior over diseases given symptom indexes reported present and absent."""
+        log_posterior = self.log_prior + self.log_yes[:, list(present)].sum(axis=1)
+        log_posterior += self.log_no[:, list(absent)].sum(axis=1)
+        log_posterior -= log_posterior.max()
+        posterior = np.exp(log_posterior)
+        return posterior / posterior.sum()
+
+    def information_gain(self, posterior):
+        """Expected entropy reduction from asking about each symptom."""
+        yes = posterior[:, None] * self.likelihood
+        no = posterior[:, None] * (1.0 - self.likelihood)
+        p_yes = yes.sum(axis=0)
+        p_no = no.sum(axis=0)
+        expected = p_yes * _entropy(yes / p_yes) + p_no * _entropy(no / p_no)
+        return _entropy(posterior) - expected
+
+    def next_question(self, present, absent, min_gain=0.01):
+        """Return the index of the symptom to ask about next, or None to stop.
+
+        Stops once no unasked symptom is expected to gain at least min_gain bits.
+        """
+        gain = self.information_gain(self.posterior(present, absent))
+        gain[list(present) + list(absent)] = -np.inf
+        best = int(np.argmax(gain))
+        return best if gain[best] >= min_gain else None
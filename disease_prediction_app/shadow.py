@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import metrics
+from .ml_utils import DISEASES, get_model_entry, get_threshold, score_features
+
+
+# Shadow scoring runs on its own small pool so it never competes with the
+# prediction executor, and jobs are dropped rather than queued without bound.
+_shadow_executor = None
+_shadow_lock = threading.Lock()
+_pending = 0
+
+_shadow_total = metrics.counter(
+    'shadow_predictions_total', 'Shadow model jobs, by whether the shadow agreed with the live model',
+    ('disease', 'outcome'))
+_shadow_latency_seconds = metrics.histogram(
+    'shadow_inference_seconds', 'Inference time of the live and shadow models on the same rows',
+    ('disease', 'model'))
+
+
+def _reset_after_fork():
+    """Drop the parent's shadow pool in a forked process, as its thread is not copied."""
+    global _shadow_executor, _shadow_lock, _pending
+    _shadow_executor = None
+    _shadow_lock = threading.Lock()
+    _pending = 0
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_executor():
+    global _shadow_executor
+    if _shadow_executor is None:
+        with _shadow_lock:
+            if _shadow_executor is None:
+                _shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow')
+    return _shadow_executor
+
+
+def submit_shadow(disease_type, features, primary_result, primary_latency_ms):
+    """Queue a candidate model to score the same features in the background.
+
+    Returns immediately; the caller never waits on the shadow model.
+    """
+    global _pending
+    shadow_model_name = getattr(settings, 'SHADOW_MODELS', {}).get(disease_type)
+    if not shadow_model_name:
+        return
+
+    with _shadow_lock:
+        if _pending >= getattr(settings, 'SHADOW_MAX_PENDING', 100):
+            dropped = True
+        else:
+            dropped = False
+            _pending += 1
+    if dropped:
+        _shadow_total.inc(disease=disease_type, outcome='dropped')
+        return
+
+    # Copy, since the caller's feature buffer is reused by the next request
+    _get_executor().submit(_run_shadow, disease_type, shadow_model_name, np.array(features),
+                           dict(primary_result), primary_latency_ms)
+
+
+def _run_shadow(disease_type, shadow_model_name, features, primary_result, primary_latency_ms):
+    global _pending
+    try:
+        config = DISEASES[disease_type]
+        model, version = get_model_entry(shadow_model_name)
+
+        start = time.perf_counter()
+        labels, probabilities = score_features(model, features, get_threshold(disease_type))
+        shadow_latency_ms = (time.perf_counter() - start) * 1000
+
+        shadow_result = config['positive_label'] if labels[0] == 1 else config['negative_label']
+        agrees = shadow_result == primary_result['prediction']
+        _shadow_total.inc(disease=disease_type, outcome='agreed' if agrees else 'disagreed')
+        _shadow_latency_seconds.observe(primary_latency_ms / 1000, disease=disease_type, model='primary')
+        _shadow_latency_seconds.observe(shadow_latency_ms / 1000, disease=disease_type, model='shadow')
+
+        from .models import ShadowPrediction
+
+        close_old_connections()
+        ShadowPrediction.objects.create(
+            disease_type=disease_type,
+            features=features.ravel().tolist(),
+            primary_model_version=primary_result.get('model_version', ''),
+            primary_result=primary_result['prediction'],
+            primary_probability=float(primary_result['probability_positive']),
+            primary_latency_ms=round(primary_latency_ms, 3),
+            shadow_model_name=shadow_model_name,
+            shadow_model_version=version,
+            shadow_result=shadow_result,
+            shadow_probability=round(float(probabilities[0][1]) * 100, 2),
+            shadow_latency_ms=round(shadow_latency_ms, 3),
+            agrees=agrees,
+        )
+    except Exception as e:
+        _shadow_total.inc(disease=disease_type, outcome='error')
+        print(f"Error running shadow model {shadow_model_name}: {e}")
+    finally:
+        close_old_connections()
+        with _shadow_lock:
+            _pending -= 1
@@ -0,0 +1,80 @@
+import re
+from difflib import get_close_matches
+
+
+# Words whose fuzzy matches are remembered; the cache is emptied when full
+_FUZZY_CACHE_SIZE = 10000
+
+
+class SymptomMatcher:
+    """Finds symptom names in free text with indexes built once per chatbot.
+
+    Gives the same symptoms as testing every synonym and symptom name as a
+    substring and running difflib over every name for each word, without
+    the per-call loops over all symptoms.
+    """
+
+    def __init__(self, symptoms, synonyms, cutoff=0.8):
+        self.cutoff = cutoff
+
+        # Phrase -> symptoms it reports, for both synonyms and symptom names
+        self.phrases = {}
+        for phrase, mapped in synonyms.items():
+            self.phrases.setdefault(phrase, set()).add(mapped)
+        self.names = {}
+        for symptom in symptoms:
+            name = symptom.replace("_", " ")
+            self.names.setdefault(name, []).append(symptom)
+            self.phrases.setdefault(name, set()).add(symptom)
+
+        # A lookahead finds the longest phrase starting at every position,
+        # including overlapping ones. Any shorter phrase starting there is a
+        # prefix of it, so each phrase also reports its prefix phrases.
+        ordered = sorted(self.phrases, key=len, reverse=True)
+        self.pattern = re.compile('(?=(' + '|'.join(re.escape(phrase) for phrase in ordered) + '))')
+        self.prefix_matches = {
+            phrase: frozenset().union(*(self.phrases[other] for other in self.phrases if phrase.startswith(other)))
+            for phrase in self.phrases
+        }
+
+        # Names grouped by length, for difflib's length-only upper bound
+        self.name_list = [symptom.replace("_", " ") for symptom in symptoms]
+        self.lengths = {}
+        for name in self.name_list:
+            self.lengths.setdefault(len(name), []).append(name)
+        self._fuzzy_cache = {}
+
+    def _candidates(self, word):
+        """Names whose length alone does not rule out a ratio above the cutoff."""
+        word_length = len(word)
+        candidates = []
+        for length, names in self.lengths.items():
+            # Same expression as SequenceMatcher.real_quick_ratio
+            if 2.0 * min(word_length, length) / (word_length + length) >= self.cutoff:
+                candidates.extend(names)
+        return candidates
+
+    def fuzzy_match(self, word):
+        """Return the symptoms whose name is difflib's closest match for word."""
+        matched = self._fuzzy_cache.get(word)
+        if matched is None:
+            close = get_close_matches(word, self._candidates(word), n=1, cutoff=self.cutoff)
+            matched = tuple(self.names[close[0]]) if close else ()
+            if len(self._fuzzy_cache) >= _FUZZY_CACHE_SIZE:
+                self._fuzzy_cache.clear()
+            self._fuzzy_cache[word] = matched
+        return matched
+
+    def extract(self, text):
+        """Return the set of symptoms mentioned in lower-cased text."""
+        extracted = set()
+
+        # 1-2. Synonyms and exact symptom names, anywhere in the text
+        for match in self.pattern.finditer(text):
+            extracted |= self.prefix_matches[match.group(1)]
+
+        # 3. Fuzzy match (typo handling)
+        for word in re.findall(r"\w+", text):
+            extracted.update(self.fuzzy_match(word))
+
+        return extracted
@@ -0,0 +1,66 @@
+import numpy as np
+from django.test import SimpleTestCase
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.svm import SVC
+
+from .linear_scorer import LinearScorer, export_linear_bundle
+
+
+class LinearScorerTests(SimpleTestCase):
+    """Exported bundles must reproduce the sklearn estimators they came from."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        rng = np.random.default_rng(0)
+        # Features on different scales, like the clinical inputs
+        scales = np.array([1.0, 10.0, 100.0, 0.1, 5.0])
+        cls.x_train = rng.normal(size=(200, 5)) * scales + scales
+        signal = ((cls.x_train - scales) / scales) @ np.array([1.0, -0.5, 0.8, 0.3, -1.2])
+        cls.y_train = (signal + rng.normal(size=200) > 0).astype(int)
+        cls.x_test = rng.normal(size=(200, 5)) * scales * 1.5 + scales
+
+    def assert_equivalent(self, estimator):
+        estimator.fit(self.x_train, self.y_train)
+        scorer = LinearScorer(export_linear_bundle(estimator))
+
+        # libsvm sums over support vectors rather than using coef_, so allow
+        # the same rounding noise export_linear_models tolerates
+        np.testing.assert_allclose(scorer.decision_function(self.x_test),
+                                   estimator.decision_function(self.x_test), rtol=0, atol=1e-8)
+        np.testing.assert_array_equal(scorer.predict(self.x_test), estimator.predict(self.x_test))
+        if hasattr(estimator, 'predict_proba'):
+            # Batches use the vectorized libsvm coupling, single rows the scalar one
+            np.testing.assert_allclose(scorer.predict_proba(self.x_test),
+                                       estimator.predict_proba(self.x_test), rtol=0, atol=1e-8)
+            for row in self.x_test[:20]:
+                np.testing.assert_allclose(scorer.predict_proba(row[None, :]),
+                                           estimator.predict_proba(row[None, :]), rtol=0, atol=1e-8)
+        else:
+            self.assertFalse(hasattr(scorer, 'predict_proba'))
+
+    def test_logistic_regression(self):
+        self.assert_equivalent(LogisticRegression(max_iter=1000))
+
+    def test_linear_svc_without_probability(self):
+        self.assert_equivalent(SVC(kernel='linear'))
+
+    def test_linear_svc_with_probability(self):
+        self.assert_equivalent(SVC(kernel='linear', probability=True, random_state=0))
+
+    def test_standard_scaler_pipeline(self):
+        self.assert_equivalent(make_pipeline(StandardScaler(), LogisticRegression()))
+        self.assert_equivalent(make_pipeline(StandardScaler(), SVC(kernel='linear', probability=True,
+                                                                   random_state=0)))
+
+    def test_min_max_scaler_pipeline(self):
+        self.assert_equivalent(make_pipeline(MinMaxScaler(), LogisticRegression()))
+        self.assert_equivalent(make_pipeline(MinMaxScaler(), SVC(kernel='linear', probability=True,
+                                                                 random_state=0)))
+
+    def test_non_linear_svc_is_rejected(self):
+        estimator = SVC(kernel='rbf').fit(self.x_train, self.y_train)
+        with self.assertRaises(ValueError):
+            export_linear_bundle(estimator)
@@ -1,6 +1,19 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Async versions of the prediction views and chatbot API for ASGI deployments
+if settings.ASYNC_VIEWS:
+    diabetes_prediction = views.diabetes_prediction_async
+    heart_disease_prediction = views.heart_disease_prediction_async
+    parkinsons_prediction = views.parkinsons_prediction_async
+    chatbot_api = views.chatbot_api_async
+else:
+    diabetes_prediction = views.diabetes_prediction
+    heart_disease_prediction = views.heart_disease_prediction
+    parkinsons_prediction = views.parkinsons_prediction
+    chatbot_api = views.chatbot_api
+
 urlpatterns = [
     # Main pages
     path('', views.home, name='home'),
@@ -20,15 +33,23 @@ urlpatterns = [
     path('doctors/', views.doctor_search, name='doctor_search'),
     
     # Disease predictions
-    path('predict/diabetes/', views.diabetes_prediction, name='diabetes_prediction'),
-    path('predict/heart-disease/', views.heart_disease_prediction, name='heart_disease_prediction'),
-    path('predict/parkinsons/', views.parkinsons_prediction, name='parkinsons_prediction'),
+    path('predict/diabetes/', diabetes_prediction, name='diabetes_prediction'),
+    path('predict/heart-disease/', heart_disease_prediction, name='heart_disease_prediction'),
+    path('predict/parkinsons/', parkinsons_prediction, name='parkinsons_prediction'),
     
+    # JSON prediction API
+    path('api/predict/<str:disease>/', views.predict_api, name='predict_api'),
+    path('api/screening/', views.screening_api, name='screening_api'),
+
     # Prediction history
     path('prediction-history/', views.prediction_history, name='prediction_history'),
     
     # Chatbot
     path('chatbot/', views.chatbot_page, name='chatbot'),
-    path('chatbot/api/', views.chatbot_api, name='chatbot_api'),
+    path('chatbot/api/', chatbot_api, name='chatbot_api'),
     path('chatbot/reset/', views.reset_chatbot, name='reset_chatbot'),
+
+    # Health checks
+    path('healthz/ready', views.readiness, name='readiness'),
+    path('metrics', views.metrics_view, name='metrics'),
 ]
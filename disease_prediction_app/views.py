@@ -12,10 +12,19 @@ from .forms import (
     ContactForm, DiabetesPredictionForm, HeartDiseasePredictionForm, 
     ParkinsonsPredictionForm
 )
-from .ml_utils import predict_diabetes, predict_heart_disease, predict_parkinsons
+from .ml_utils import (
+    DISEASES, predict, predict_batch, predict_diabetes, predict_heart_disease,
+    predict_parkinsons, predict_screening, save_predictions, screening_inputs
+)
 from .chatbot_utils import get_chatbot
+from .warmup import get_readiness
+from .executors import get_prediction_executor
+from . import metrics
+import asyncio
 import json
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.csrf import csrf_exempt
 
 
 def home(request):
@@ -181,6 +190,7 @@ def diabetes_prediction(request):
                     disease_type='diabetes',
                     prediction_result=prediction_result['prediction'],
                     confidence_score=prediction_result['confidence'],
+                    model_version=prediction_result.get('model_version', ''),
                     input_data=form.cleaned_data
                 )
                 
@@ -213,6 +223,7 @@ def heart_disease_prediction(request):
                     disease_type='heart_disease',
                     prediction_result=prediction_result['prediction'],
                     confidence_score=prediction_result['confidence'],
+                    model_version=prediction_result.get('model_version', ''),
                     input_data=form.cleaned_data
                 )
                 
@@ -245,6 +256,7 @@ def parkinsons_prediction(request):
                     disease_type='parkinsons',
                     prediction_result=prediction_result['prediction'],
                     confidence_score=prediction_result['confidence'],
+                    model_version=prediction_result.get('model_version', ''),
                     input_data=form.cleaned_data
                 )
                 
@@ -261,6 +273,68 @@ def parkinsons_prediction(request):
     return render(request, 'parkinsons_prediction.html', {'form': form})
 
 
+async def _run_in_executor(func, *args):
+    """Run blocking work on the bounded prediction executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_prediction_executor(), func, *args)
+
+
+async def _async_prediction(request, form_class, predict, disease_type, disease_name, template_name):
+    """Shared body of the async prediction views."""
+    # Resolve the user once so templates do not trigger a sync lookup
+    request.user = await request.auser()
+
+    if request.method == 'POST':
+        form = form_class(request.POST)
+        if form.is_valid():
+            try:
+                # Get prediction
+                prediction_result = await _run_in_executor(predict, form.cleaned_data)
+
+                # Save prediction to database
+                await Prediction.objects.acreate(
+                    user=request.user,
+                    disease_type=disease_type,
+                    prediction_result=prediction_result['prediction'],
+                    confidence_score=prediction_result['confidence'],
+                    model_version=prediction_result.get('model_version', ''),
+                    input_data=form.cleaned_data
+                )
+
+                return render(request, 'prediction_result.html', {
+                    'disease_type': disease_name,
+                    'prediction_result': prediction_result,
+                    'form': form
+                })
+            except Exception as e:
+                messages.error(request, f'Prediction failed: {str(e)}')
+    else:
+        form = form_class()
+
+    return render(request, template_name, {'form': form})
+
+
+@login_required
+async def diabetes_prediction_async(request):
+    """Async diabetes prediction view."""
+    return await _async_prediction(request, DiabetesPredictionForm, predict_diabetes,
+                                   'diabetes', 'Diabetes', 'diabetes_prediction.html')
+
+
+@login_required
+async def heart_disease_prediction_async(request):
+    """Async heart disease prediction view."""
+    return await _async_prediction(request, HeartDiseasePredictionForm, predict_heart_disease,
+                                   'heart_disease', 'Heart Disease', 'heart_disease_prediction.html')
+
+
+@login_required
+async def parkinsons_prediction_async(request):
+    """Async Parkinson's disease prediction view."""
+    return await _async_prediction(request, ParkinsonsPredictionForm, predict_parkinsons,
+                                   'parkinsons', 'Parkinson\'s Disease', 'parkinsons_prediction.html')
+
+
 @login_required
 def prediction_history(request):
     """User's prediction history view."""
@@ -316,6 +390,7 @@ def make_prediction(request):
                 # Expecting result as dict with 'prediction' and 'confidence'
                 prediction.prediction_result = result['prediction']
                 prediction.confidence_score = result['confidence']
+                prediction.model_version = result.get('model_version', '')
                 prediction.save()
                 
                 messages.success(request, 'Prediction made successfully!')
@@ -328,133 +403,299 @@ def make_prediction(request):
     return render(request, 'make_prediction.html', {'form': form})
 
 
+def _api_error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+class _CsrfCheck(CsrfViewMiddleware):
+    def _reject(self, request, reason):
+        return reason
+
+
+def _api_user(request):
+    """Return (user to save predictions for, error response) for a JSON API call.
+
+    The API views are csrf_exempt so that scripts can post JSON without a
+    token, and such callers get results without anything being saved. A
+    logged-in browser session must still pass the CSRF check, so other sites
+    cannot add rows to the user's prediction history.
+    """
+    if not request.user.is_authenticated:
+        return None, None
+
+    check = _CsrfCheck(lambda request: None)
+    check.process_request(request)
+    reason = check.process_view(request, None, (), {})
+    if reason:
+        return None, _api_error(f'CSRF check failed: {reason}', status=403)
+    return request.user, None
+
+
+def _missing_fields(schema, record):
+    if not isinstance(record, dict):
+        return None
+    return [name for name in schema.names if name not in record]
+
+
+@csrf_exempt
+def predict_api(request, disease):
+    """JSON prediction endpoint accepting one record or a list of records."""
+    if request.method != 'POST':
+        return _api_error('Only POST is supported', status=405)
+
+    disease_type = disease.replace('-', '_')
+    if disease_type not in DISEASES:
+        return _api_error(f'Unknown disease: {disease}', status=404)
+    schema = DISEASES[disease_type]['schema']
+
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return _api_error('Request body must be valid JSON')
+
+    records = payload if isinstance(payload, list) else [payload]
+    if not records:
+        return _api_error('No records to score')
+    max_batch_size = getattr(settings, 'API_MAX_BATCH_SIZE', 1000)
+    if len(records) > max_batch_size:
+        return _api_error(f'At most {max_batch_size} records can be scored per request')
+
+    for index, record in enumerate(records):
+        missing = _missing_fields(schema, record)
+        if missing is None:
+            return _api_error(f'Record {index} must be a JSON object')
+        if missing:
+            return _api_error(f"Record {index} is missing fields: {', '.join(missing)}")
+
+    user, error = _api_user(request)
+    if error is not None:
+        return error
+    try:
+        if isinstance(payload, list):
+            return JsonResponse({'results': predict_batch(disease_type, records, user=user)})
+
+        result = predict(disease_type, payload)
+        if user is not None:
+            save_predictions(user, disease_type, [payload], [result])
+        return JsonResponse(result)
+    except (TypeError, ValueError) as e:
+        return _api_error(str(e))
+
+
+@csrf_exempt
+def screening_api(request):
+    """JSON endpoint scoring diabetes, heart disease and Parkinson's for one patient."""
+    if request.method != 'POST':
+        return _api_error('Only POST is supported', status=405)
+
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return _api_error('Request body must be valid JSON')
+    if not isinstance(payload, dict):
+        return _api_error('Request body must be a JSON object')
+
+    for disease_type, record in screening_inputs(payload).items():
+        missing = _missing_fields(DISEASES[disease_type]['schema'], record)
+        if missing:
+            return _api_error(f"Missing {disease_type} fields: {', '.join(missing)}")
+
+    user, error = _api_user(request)
+    if error is not None:
+        return error
+    try:
+        return JsonResponse({'results': predict_screening(payload, user=user)})
+    except (TypeError, ValueError) as e:
+        return _api_error(str(e))
+
+
 def chatbot_page(request):
     """Chatbot page view."""
     return render(request, 'chatbot.html')
 
 
+def _new_chatbot_session():
+    return {
+        'symptoms': [],
+        'conversation_stage': 'initial',
+        'user_info': {},
+        'current_disease': None,
+        'confidence': 0
+    }
+
+
+def _planner_enabled():
+    return getattr(settings, 'CHATBOT_QUESTION_PLANNER', {}).get('ENABLED', False)
+
+
+def _chatbot_reply(message, session_data):
+    """Advance a chatbot conversation by one message.
+
+    Returns the response text and the session data to store, or None as the
+    response when the chatbot model is unavailable.
+    """
+    chatbot = get_chatbot()
+
+    if chatbot.forest is None:
+        return None, session_data
+
+    # Process the message based on conversation stage
+    if session_data['conversation_stage'] == 'initial':
+        # Extract symptoms from initial message
+        symptoms = chatbot.extract_symptoms(message)
+        if symptoms:
+            session_data['symptoms'] = symptoms
+            session_data['conversation_stage'] = 'symptoms_confirmed'
+
+            # Get initial prediction
+            disease, confidence, _ = chatbot.predict_disease(symptoms)
+            session_data['current_disease'] = disease
+            session_data['confidence'] = confidence
+
+            # Get related symptoms to ask about
+            if _planner_enabled():
+                # Questions are planned one at a time from the answers so far
+                next_symptom = chatbot.next_question(symptoms, [])
+                related_symptoms = [next_symptom] if next_symptom else []
+            else:
+                related_symptoms = chatbot.get_related_symptoms(disease, symptoms)
+            session_data['related_symptoms'] = related_symptoms[:5]  # Limit to 5 questions
+            session_data['denied_symptoms'] = []
+            session_data['current_question'] = 0
+
+            response = f"✅ I detected these symptoms: {', '.join(symptoms)}\n\n"
+            response += f"🤖 Based on your symptoms, you might have **{disease}** (Confidence: {confidence}%)\n\n"
+            response += f"📖 About {disease}: {chatbot.get_disease_description(disease)}\n\n"
+
+            if related_symptoms:
+                response += f"Let me ask you a few more questions to get a more accurate diagnosis:\n"
+                response += f"👉 Do you also have {related_symptoms[0].replace('_', ' ')}? (yes/no)"
+            else:
+                response += "I have enough information to provide you with a diagnosis and recommendations."
+                session_data['conversation_stage'] = 'complete'
+
+        else:
+            response = "❌ I couldn't detect any specific symptoms in your message. Please describe your symptoms more clearly (e.g., 'I have fever and headache')."
+
+    elif session_data['conversation_stage'] == 'symptoms_confirmed':
+        # Process yes/no answers for related symptoms
+        answer = message.lower().strip()
+        related_symptoms = session_data.get('related_symptoms', [])
+        current_question = session_data.get('current_question', 0)
+
+        if answer in ['yes', 'y', 'true', '1']:
+            session_data['symptoms'].append(related_symptoms[current_question])
+        else:
+            session_data.setdefault('denied_symptoms', []).append(related_symptoms[current_question])
+
+        # Move to next question or complete
+        current_question += 1
+        session_data['current_question'] = current_question
+
+        max_questions = getattr(settings, 'CHATBOT_QUESTION_PLANNER', {}).get('MAX_QUESTIONS', 5)
+        if _planner_enabled() and current_question == len(related_symptoms) and current_question < max_questions:
+            next_symptom = chatbot.next_question(session_data['symptoms'], session_data.get('denied_symptoms', []))
+            if next_symptom:
+                session_data['related_symptoms'] = related_symptoms = related_symptoms + [next_symptom]
+
+        if current_question < len(related_symptoms):
+            response = f"👉 Do you also have {related_symptoms[current_question].replace('_', ' ')}? (yes/no)"
+        else:
+            # Final prediction
+            disease, confidence, _ = chatbot.predict_disease(session_data['symptoms'])
+            session_data['current_disease'] = disease
+            session_data['confidence'] = confidence
+            session_data['conversation_stage'] = 'complete'
+
+            response = f"🎯 **Final Diagnosis**: {disease} (Confidence: {confidence}%)\n\n"
+            response += f"📖 **About {disease}**: {chatbot.get_disease_description(disease)}\n\n"
+
+            precautions = chatbot.get_disease_precautions(disease)
+            if precautions:
+                response += "🛡️ **Recommended Precautions**:\n"
+                for i, prec in enumerate(precautions, 1):
+                    response += f"{i}. {prec}\n"
+                response += "\n"
+
+            response += f"💡 {chatbot.get_random_quote()}\n\n"
+            response += "⚠️ **Important**: This is an AI-powered assessment and should not replace professional medical advice. Please consult a healthcare provider for proper diagnosis and treatment."
+
+    elif session_data['conversation_stage'] == 'complete':
+        # Reset conversation
+        session_data = _new_chatbot_session()
+        response = "🔄 Starting a new consultation. Please describe your symptoms (e.g., 'I have fever and headache')."
+
+    else:
+        response = "I'm not sure how to help with that. Please describe your symptoms clearly."
+
+    return response, session_data
+
+
+def _chatbot_response(response):
+    if response is None:
+        return JsonResponse({
+            'response': 'Sorry, the chatbot is currently unavailable. Please try again later.',
+            'type': 'error'
+        })
+    return JsonResponse({
+        'response': response,
+        'type': 'success'
+    })
+
+
+def _chatbot_error(e):
+    return JsonResponse({
+        'response': f'Sorry, there was an error processing your request: {str(e)}',
+        'type': 'error'
+    })
+
+
 def chatbot_api(request):
     """Chatbot API endpoint for AJAX requests."""
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
             message = data.get('message', '')
-            session_key = data.get('session_key', '')
-            
+
             # Get or create session data
-            if 'chatbot_session' not in request.session:
-                request.session['chatbot_session'] = {
-                    'symptoms': [],
-                    'conversation_stage': 'initial',
-                    'user_info': {},
-                    'current_disease': None,
-                    'confidence': 0
-                }
-            
-            session_data = request.session['chatbot_session']
-            chatbot = get_chatbot()
-            
-            if not chatbot.model:
-                return JsonResponse({
-                    'response': 'Sorry, the chatbot is currently unavailable. Please try again later.',
-                    'type': 'error'
-                })
-            
-            # Process the message based on conversation stage
-            if session_data['conversation_stage'] == 'initial':
-                # Extract symptoms from initial message
-                symptoms = chatbot.extract_symptoms(message)
-                if symptoms:
-                    session_data['symptoms'] = symptoms
-                    session_data['conversation_stage'] = 'symptoms_confirmed'
-                    
-                    # Get initial prediction
-                    disease, confidence, _ = chatbot.predict_disease(symptoms)
-                    session_data['current_disease'] = disease
-                    session_data['confidence'] = confidence
-                    
-                    # Get related symptoms to ask about
-                    related_symptoms = chatbot.get_related_symptoms(disease, symptoms)
-                    session_data['related_symptoms'] = related_symptoms[:5]  # Limit to 5 questions
-                    session_data['current_question'] = 0
-                    
-                    response = f"✅ I detected these symptoms: {', '.join(symptoms)}\n\n"
-                    response += f"🤖 Based on your symptoms, you might have **{disease}** (Confidence: {confidence}%)\n\n"
-                    response += f"📖 About {disease}: {chatbot.get_disease_description(disease)}\n\n"
-                    
-                    if related_symptoms:
-                        response += f"Let me ask you a few more questions to get a more accurate diagnosis:\n"
-                        response += f"👉 Do you also have {related_symptoms[0].replace('_', ' ')}? (yes/no)"
-                    else:
-                        response += "I have enough information to provide you with a diagnosis and recommendations."
-                        session_data['conversation_stage'] = 'complete'
-                        
-                else:
-                    response = "❌ I couldn't detect any specific symptoms in your message. Please describe your symptoms more clearly (e.g., 'I have fever and headache')."
-                    
-            elif session_data['conversation_stage'] == 'symptoms_confirmed':
-                # Process yes/no answers for related symptoms
-                answer = message.lower().strip()
-                related_symptoms = session_data.get('related_symptoms', [])
-                current_question = session_data.get('current_question', 0)
-                
-                if answer in ['yes', 'y', 'true', '1']:
-                    session_data['symptoms'].append(related_symptoms[current_question])
-                
-                # Move to next question or complete
-                current_question += 1
-                session_data['current_question'] = current_question
-                
-                if current_question < len(related_symptoms):
-                    response = f"👉 Do you also have {related_symptoms[current_question].replace('_', ' ')}? (yes/no)"
-                else:
-                    # Final prediction
-                    disease, confidence, _ = chatbot.predict_disease(session_data['symptoms'])
-                    session_data['current_disease'] = disease
-                    session_data['confidence'] = confidence
-                    session_data['conversation_stage'] = 'complete'
-                    
-                    response = f"🎯 **Final Diagnosis**: {disease} (Confidence: {confidence}%)\n\n"
-                    response += f"📖 **About {disease}**: {chatbot.get_disease_description(disease)}\n\n"
-                    
-                    precautions = chatbot.get_disease_precautions(disease)
-                    if precautions:
-                        response += "🛡️ **Recommended Precautions**:\n"
-                        for i, prec in enumerate(precautions, 1):
-                            response += f"{i}. {prec}\n"
-                        response += "\n"
-                    
-                    response += f"💡 {chatbot.get_random_quote()}\n\n"
-                    response += "⚠️ **Important**: This is an AI-powered assessment and should not replace professional medical advice. Please consult a healthcare provider for proper diagnosis and treatment."
-                    
-            elif session_data['conversation_stage'] == 'complete':
-                # Reset conversation
-                request.session['chatbot_session'] = {
-                    'symptoms': [],
-                    'conversation_stage': 'initial',
-                    'user_info': {},
-                    'current_disease': None,
-                    'confidence': 0
-                }
-                response = "🔄 Starting a new consultation. Please describe your symptoms (e.g., 'I have fever and headache')."
-            
-            else:
-                response = "I'm not sure how to help with that. Please describe your symptoms clearly."
-            
+            session_data = request.session.get('chatbot_session') or _new_chatbot_session()
+            response, session_data = _chatbot_reply(message, session_data)
+
             # Save session data
+            request.session['chatbot_session'] = session_data
             request.session.save()
-            
-            return JsonResponse({
-                'response': response,
-                'type': 'success'
-            })
-            
+
+            return _chatbot_response(response)
+
         except Exception as e:
-            return JsonResponse({
-                'response': f'Sorry, there was an error processing your request: {str(e)}',
-                'type': 'error'
-            })
-    
+            return _chatbot_error(e)
+
+    return JsonResponse({
+        'response': 'Invalid request method',
+        'type': 'error'
+    })
+
+
+async def chatbot_api_async(request):
+    """Async chatbot API endpoint; chatbot work runs on the prediction executor."""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            message = data.get('message', '')
+
+            # Get or create session data
+            session_data = await request.session.aget('chatbot_session') or _new_chatbot_session()
+            response, session_data = await _run_in_executor(_chatbot_reply, message, session_data)
+
+            # Save session data
+            await request.session.aset('chatbot_session', session_data)
+            await request.session.asave()
+
+            return _chatbot_response(response)
+
+        except Exception as e:
+            return _chatbot_error(e)
+
     return JsonResponse({
         'response': 'Invalid request method',
         'type': 'error'
@@ -466,3 +707,17 @@ def reset_chatbot(request):
     if 'chatbot_session' in request.session:
         del request.session['chatbot_session']
     return JsonResponse({'status': 'success'})
+
+
+def readiness(request):
+    """Readiness probe reporting the load state of models and the chatbot."""
+    is_ready, components = get_readiness()
+    return JsonResponse({
+        'status': 'ready' if is_ready else 'not_ready',
+        'components': components,
+    }, status=200 if is_ready else 503)
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint for prediction, chatbot and request metrics."""
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
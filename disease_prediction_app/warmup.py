@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+from .ml_utils import DISEASES, get_model, get_model_stats
+from .chatbot_utils import get_chatbot
+
+
+# Load state of every component a worker needs before it can serve traffic.
+# Each entry holds a status ('pending', 'loading', 'ready' or 'error'), the
+# load time in milliseconds and the error message if loading failed.
+_component_state = {}
+_state_lock = threading.Lock()
+
+
+def _set_state(component, **values):
+    with _state_lock:
+        _component_state.setdefault(component, {}).update(values)
+
+
+def _warm_component(component, loader):
+    """Run a loader and record how long it took and whether it succeeded."""
+    _set_state(component, status='loading', load_time_ms=None, error=None)
+    start = time.perf_counter()
+    try:
+        loader()
+    except Exception as e:
+        _set_state(component, status='error', error=str(e))
+    else:
+        _set_state(component, status='ready')
+    finally:
+        _set_state(component, load_time_ms=round((time.perf_counter() - start) * 1000, 2))
+
+
+def _warm_chatbot():
+    chatbot = get_chatbot()
+    if chatbot.forest is None:
+        raise Exception('Chatbot model failed to initialize')
+
+
+def get_components():
+    """Return the component names the warm-up covers."""
+    return [config['model_name'] for config in DISEASES.values()] + ['chatbot']
+
+
+def warm_up():
+    """Load every prediction model and the chatbot engine."""
+    for component in get_components():
+        _set_state(component, status='pending', load_time_ms=None, error=None)
+
+    for config in DISEASES.values():
+        model_name = config['model_name']
+        _warm_component(model_name, lambda name=model_name: get_model(name))
+    _warm_component('chatbot', _warm_chatbot)
+
+
+def _reset_lock_after_fork():
+    """Give a forked process a fresh lock, as the parent's warm-up thread may have held it."""
+    global _state_lock
+    _state_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_lock_after_fork)
+
+_started = False
+
+
+def restart_after_fork():
+    """Restart warm-up in a gunicorn worker forked from a master that already started it.
+
+    Threads are not copied by fork, so under gunicorn --preload the master's
+    warm-up thread never runs in the workers. Called from the post_fork hook
+    in gunicorn.conf.py rather than on every fork, so executor pool children
+    do not load every model and the chatbot.
+    """
+    if _started:
+        start_warm_up()
+
+
+def start_warm_up():
+    """Warm up in a background thread so startup is not blocked.
+
+    Under gunicorn --preload this runs in the master; every worker then
+    starts its own warm-up, reusing whatever the master already loaded.
+    """
+    global _started
+    _started = True
+
+    for component in get_components():
+        _set_state(component, status='pending', load_time_ms=None, error=None)
+
+    thread = threading.Thread(target=warm_up, name='warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def get_readiness():
+    """Return (is_ready, per-component state) for the readiness endpoint.
+
+    Components that were never warmed up are reported as 'not_loaded' and
+    do not hold back readiness, so lazy loading keeps working when warm-up
+    is disabled.
+    """
+    model_stats = get_model_stats()
+    with _state_lock:
+        components = {name: dict(state) for name, state in _component_state.items()}
+
+    for name in get_components():
+        if name not in components:
+            stats = model_stats.get(name)
+            if stats is not None:
+                components[name] = {'status': 'ready', 'load_time_ms': stats['load_time_ms'], 'error': None}
+            else:
+                components[name] = {'status': 'not_loaded', 'load_time_ms': None, 'error': None}
+
+    is_ready = all(state['status'] in ('ready', 'not_loaded') for state in components.values())
+    return is_ready, components
@@ -0,0 +1,10 @@
+# Gunicorn reads this file from the working directory by default.
+import sys
+
+
+def post_fork(server, worker):
+    # With --preload the app, and its warm-up thread, started in the master.
+    # Threads do not survive fork, so start warm-up again in each worker.
+    warmup = sys.modules.get('disease_prediction_app.warmup')
+    if warmup is not None:
+        warmup.restart_after_fork()